@@ -3,6 +3,7 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property
 from typing import Any, Optional
 
 
@@ -27,9 +28,13 @@ class PermissionDecision(Enum):
     DENY = "deny"
 
 
-@dataclass
+@dataclass(slots=True)
 class CheckResult:
-    """Result of a security check."""
+    """Result of a security check.
+
+    Results may be shared between calls (allow results are cached per
+    check), so treat them as immutable.
+    """
 
     status: CheckStatus
     reason: str = ""
@@ -40,17 +45,17 @@ class CheckResult:
     @property
     def is_allowed(self) -> bool:
         """Check if the result allows the operation."""
-        return self.status == CheckStatus.ALLOW
+        return self.status is CheckStatus.ALLOW
 
     @property
     def is_blocked(self) -> bool:
         """Check if the result blocks the operation."""
-        return self.status == CheckStatus.BLOCK
+        return self.status is CheckStatus.BLOCK
 
     @property
     def needs_confirmation(self) -> bool:
         """Check if the result requires user confirmation."""
-        return self.status == CheckStatus.CONFIRM
+        return self.status is CheckStatus.CONFIRM
 
     @property
     def permission_decision(self) -> PermissionDecision:
@@ -64,9 +69,9 @@ class CheckResult:
         """
         if self.decision is not None:
             return self.decision
-        if self.status == CheckStatus.ALLOW:
+        if self.status is CheckStatus.ALLOW:
             return PermissionDecision.ALLOW
-        if self.status == CheckStatus.CONFIRM:
+        if self.status is CheckStatus.CONFIRM:
             return PermissionDecision.ASK
         # BLOCK defaults to DENY
         return PermissionDecision.DENY
@@ -124,10 +129,15 @@ class SecurityCheck(ABC):
         """
         return CheckResult(status=CheckStatus.ALLOW)
 
-    def _allow(self) -> CheckResult:
-        """Create an allow result."""
+    @cached_property
+    def _allow_result(self) -> CheckResult:
+        """Allow result shared by all calls on this check."""
         return CheckResult(status=CheckStatus.ALLOW, check_name=self.name)
 
+    def _allow(self) -> CheckResult:
+        """Get the (shared) allow result."""
+        return self._allow_result
+
     def _block(
         self,
         reason: str,
@@ -28,7 +28,7 @@ class BypassCheck(SecurityCheck):
             return result
 
         # Check for pipe to shell
-        result = self._check_pipe_to_shell(parsed_commands)
+        result = self._check_pipe_to_shell(raw_command, parsed_commands)
         if not result.is_allowed:
             return result
 
@@ -80,8 +80,14 @@ class BypassCheck(SecurityCheck):
 
         return self._allow()
 
-    def _check_pipe_to_shell(self, parsed_commands: list[ParsedCommand]) -> CheckResult:
+    def _check_pipe_to_shell(
+        self, raw_command: str, parsed_commands: list[ParsedCommand]
+    ) -> CheckResult:
         """Check for piping output to shell."""
+        # No pipe character, no pipeline (quoting can hide the target, not the |)
+        if "|" not in raw_command:
+            return self._allow()
+
         shell_targets = self.config.bypass_prevention.block_shell_pipe_targets
 
         if is_pipe_to_shell(parsed_commands, shell_targets):
@@ -8,67 +8,375 @@ indicate potential exfiltration or malicious behavior:
 - System reconnaissance
 """
 
+import bisect
+import os
 import re
+import warnings
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 from checks.base import CheckResult, SecurityCheck
 
+try:
+    # Optional: linear-time matching without catastrophic backtracking
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    # Optional: single-pass multi-pattern prefilter
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    # Optional: literal prefilter when Hyperscan is not available
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    # Internal regex parser, only used to find literals for the Aho-Corasick
+    # prefilter; without it that prefilter is skipped
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            import sre_parse
+    except ImportError:
+        sre_parse = None
+
+
+_NEWLINE_RE = re.compile("\n")
+
+# Group openers that neither capture nor set flags
+_PLAIN_GROUP_PREFIXES = ("(?:", "(?=", "(?!", "(?<=", "(?<!")
+
+# Characters after a backslash that make a backreference (\1-\9, \g<name>)
+_BACKREF_ESCAPES = frozenset("123456789g")
+
+# Script file extensions that are content-checked
+SCRIPT_EXTENSIONS = frozenset({".py", ".sh", ".bash", ".rb", ".pl", ".js"})
+
+
+def _compile(source: str) -> re.Pattern:
+    """Compile a pattern with RE2 if available, falling back to re.
+
+    RE2 rejects constructs it can't run in linear time (backreferences,
+    lookarounds); such patterns are compiled with the re module instead.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(source)
+        except re2.error:
+            pass
+    return re.compile(source)
+
+
+def _is_combinable(source: str) -> bool:
+    """Check whether a pattern can safely join a combined alternation.
+
+    Global inline flags (e.g. "(?i)") must start the whole pattern, and
+    groups may clash by name or shift backreference numbers, so only
+    patterns whose groups are all non-capturing or lookarounds, and that
+    have no backreferences, qualify. Anything unusual is left out.
+    """
+    i = 0
+    in_class = False
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            if source[i + 1:i + 2] in _BACKREF_ESCAPES:
+                return False
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # "]" right after "[" or "[^" is a literal, not the end
+            if source[i + 1:i + 2] == "^":
+                i += 1
+            if source[i + 1:i + 2] == "]":
+                i += 1
+        elif char == "(" and not source.startswith(_PLAIN_GROUP_PREFIXES, i):
+            return False
+        i += 1
+    return True
+
+
+class _PatternSet:
+    """Patterns of one category, searched one by one in config order.
+
+    Patterns without inline flags or groups are also joined into one
+    alternation, so content without any of them is rejected in one pass.
+    """
+
+    def __init__(self, sources: Iterable[str]):
+        self.sources = tuple(sources)
+        self.patterns = [_compile(source) for source in self.sources]
+        self.simple = frozenset()
+        self.combined = None
+        try:
+            simple = [
+                i for i, source in enumerate(self.sources) if _is_combinable(source)
+            ]
+            if len(simple) > 1:
+                self.combined = _compile(
+                    "|".join(f"(?:{self.sources[i]})" for i in simple)
+                )
+                self.simple = frozenset(simple)
+        except Exception:
+            # Can't combine safely: every pattern is searched on its own
+            self.combined = None
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def first_matches(
+        self,
+        content: str,
+        candidates: Optional[Iterable[int]] = None,
+        limit: Optional[int] = None,
+    ) -> list[tuple[int, re.Match]]:
+        """Find the first match of each pattern, in config order.
+
+        Args:
+            content: Text to search.
+            candidates: Indexes of patterns that may match (None for all).
+            limit: Stop once this many patterns have matched.
+
+        Returns:
+            (pattern index, match) pairs, at most one per pattern.
+        """
+        if candidates is None:
+            candidates = range(len(self.patterns))
+            if self.combined is not None and not self.combined.search(content):
+                candidates = [i for i in candidates if i not in self.simple]
+        matches = []
+        for i in sorted(candidates):
+            match = self.patterns[i].search(content)
+            if match:
+                matches.append((i, match))
+                if len(matches) == limit:
+                    break
+        return matches
+
+
+def _env_var_regex(env_vars: list[str]) -> Optional[re.Pattern]:
+    """Build one regex matching access to any of the given env vars.
+
+    Matches os.getenv('VAR') and os.environ['VAR'], capturing the
+    variable name in the 'var' group.
+
+    Args:
+        env_vars: Secret env var names.
+
+    Returns:
+        Compiled pattern, or None if there are no variables.
+    """
+    if not env_vars:
+        return None
+    names = "|".join(re.escape(var) for var in env_vars)
+    return _compile(
+        rf"(?:getenv|environ)\s*[\[\(]['\"]?(?P<var>{names})['\"]?[\]\)]"
+    )
+
+
+def _hyperscan_db(sources: list[str]):
+    """Build a Hyperscan database that reports which sources may match.
+
+    Patterns are compiled in prefilter mode, so a source that can match is
+    always reported (unsupported constructs are approximated by a superset).
+    Expression ids are indexes into `sources`.
+
+    Args:
+        sources: Regex sources, one per pattern.
+
+    Returns:
+        hyperscan.Database, or None if Hyperscan is unavailable or
+        rejects a pattern.
+    """
+    if hyperscan is None or not sources:
+        return None
+    flags = (
+        hyperscan.HS_FLAG_SINGLEMATCH
+        | hyperscan.HS_FLAG_PREFILTER
+        | hyperscan.HS_FLAG_ALLOWEMPTY
+        | hyperscan.HS_FLAG_UTF8
+        | hyperscan.HS_FLAG_UCP
+    )
+    db = hyperscan.Database()
+    try:
+        db.compile(
+            expressions=[source.encode() for source in sources],
+            ids=list(range(len(sources))),
+            elements=len(sources),
+            flags=flags,
+        )
+    except hyperscan.error:
+        return None
+    return db
+
+
+def _literal_seeds(items) -> Optional[frozenset[str]]:
+    """Find literals of which any match must contain at least one.
+
+    Walks a parsed regex (sre_parse) looking for runs of literal
+    characters, mandatory groups and alternations whose every branch has
+    seeds, and keeps the candidate set with the longest shortest literal.
+
+    Returns:
+        Set of seed literals, or None if no seed is required.
+    """
+    best = None
+    run = []
+    for op, av in [*items, (None, None)]:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        candidate = None
+        if run:
+            candidate = frozenset(["".join(run)])
+            run = []
+        best = _better_seeds(best, candidate)
+        if op is sre_parse.SUBPATTERN:
+            _group, add_flags, _del_flags, inner = av
+            if not add_flags & re.IGNORECASE:
+                best = _better_seeds(best, _literal_seeds(inner))
+        elif op is sre_parse.BRANCH:
+            branches = [_literal_seeds(branch) for branch in av[1]]
+            if all(branches):
+                best = _better_seeds(best, frozenset().union(*branches))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            best = _better_seeds(best, _literal_seeds(av[2]))
+    return best
+
+
+def _better_seeds(
+    current: Optional[frozenset[str]],
+    candidate: Optional[frozenset[str]],
+) -> Optional[frozenset[str]]:
+    """Pick the more selective of two seed sets (longest shortest seed)."""
+    if not candidate:
+        return current
+    if not current:
+        return candidate
+    if min(map(len, candidate)) > min(map(len, current)):
+        return candidate
+    return current
+
+
+def _literal_automaton(sources: list[str]):
+    """Build an Aho-Corasick automaton over required literals of sources.
+
+    Each automaton value is the tuple of source indexes that need the
+    literal. Sources without a required literal (or parsed with
+    IGNORECASE) can't be prefiltered and are returned separately.
+
+    Args:
+        sources: Regex sources, one per pattern.
+
+    Returns:
+        (automaton, indexes that must always be scanned), or None if
+        pyahocorasick or the regex parser is unavailable.
+    """
+    if ahocorasick is None or sre_parse is None or not sources:
+        return None
+    seeds_to_ids: dict[str, list[int]] = {}
+    always = []
+    for i, source in enumerate(sources):
+        seeds = None
+        try:
+            parsed = sre_parse.parse(source)
+            if not parsed.state.flags & re.IGNORECASE:
+                seeds = _literal_seeds(list(parsed))
+        except Exception:
+            # Parser internals differ between Python versions: scan always
+            seeds = None
+        if not seeds:
+            always.append(i)
+            continue
+        for seed in seeds:
+            seeds_to_ids.setdefault(seed, []).append(i)
+    automaton = ahocorasick.Automaton()
+    for seed, ids in seeds_to_ids.items():
+        automaton.add_word(seed, tuple(ids))
+    if seeds_to_ids:
+        automaton.make_automaton()
+    return automaton, tuple(always)
+
+
+def _bullets(items: Iterable[str], prefix: str = "    - ") -> list[str]:
+    """Format items as guidance bullet lines."""
+    return [f"{prefix}{item}" for item in items]
+
 
 class CodeContentCheck(SecurityCheck):
     """Check script content for dangerous patterns."""
 
     name = "code_content_check"
 
+    # Read at most this many bytes of a script file
+    MAX_SCAN_BYTES = 512 * 1024
+
+    # Findings listed per category in guidance (scanning stops there too)
+    MAX_LISTED = 3
+    MAX_LISTED_STANDALONE = 5  # secret scanning / dynamic execution
+
     def __init__(self, config):
         super().__init__(config)
         # Compile regex patterns from config
         self._compile_patterns()
 
     def _compile_patterns(self):
-        """Compile regex patterns from config."""
+        """Compile regex patterns from config.
+
+        Every pattern is compiled on its own; see _PatternSet for how a
+        category is searched.
+        """
         ops = self.config.dangerous_operations
 
-        self.network_patterns = [
-            re.compile(p) for p in ops.network
-        ]
-        self.sensitive_patterns = [
-            re.compile(p) for p in ops.sensitive_access
-        ]
-        self.scanning_patterns = [
-            re.compile(p) for p in ops.secret_scanning
-        ]
-        self.recon_patterns = [
-            re.compile(p) for p in ops.system_recon
-        ]
-        self.dynamic_patterns = [
-            re.compile(p) for p in ops.dynamic_execution
-        ]
+        self.network_patterns = _PatternSet(ops.network)
+        self.sensitive_patterns = _PatternSet(ops.sensitive_access)
+        self.scanning_patterns = _PatternSet(ops.secret_scanning)
+        self.recon_patterns = _PatternSet(ops.system_recon)
+        self.dynamic_patterns = _PatternSet(ops.dynamic_execution)
 
-        # Compile code patterns from sensitive_files config
-        self.code_patterns = []
-        for item in self.config.sensitive_files.code_patterns:
-            self.code_patterns.append({
-                "pattern": re.compile(item.pattern),
-                "description": item.description,
-            })
-
-        # Custom patterns
-        for item in self.config.sensitive_files.custom_patterns:
-            self.code_patterns.append({
-                "pattern": re.compile(item.pattern),
-                "description": item.description,
-            })
-
-        # Secret env var patterns
-        self.env_var_patterns = []
-        for var in self.config.sensitive_files.secret_env_vars:
-            # Match os.getenv('VAR'), os.environ['VAR'], os.environ.get('VAR')
-            self.env_var_patterns.append(
-                re.compile(
-                    rf"(getenv|environ)\s*[\[\(]['\"]?{re.escape(var)}['\"]?[\]\)]"
-                )
-            )
+        # Code patterns from sensitive_files config plus custom patterns
+        code_items = [
+            *self.config.sensitive_files.code_patterns,
+            *self.config.sensitive_files.custom_patterns,
+        ]
+        self.code_patterns = _PatternSet(item.pattern for item in code_items)
+        # Pattern index -> description, for guidance messages
+        self.code_descriptions = [item.description for item in code_items]
+
+        self.env_var_re = _env_var_regex(self.config.sensitive_files.secret_env_vars)
+
+        # Prefilter: one pass tells which patterns can match.
+        # Hyperscan if available, else Aho-Corasick over required literals.
+        self.prefilter_keys = []
+        sources = []
+        for name in (
+            "network_patterns",
+            "sensitive_patterns",
+            "scanning_patterns",
+            "recon_patterns",
+            "dynamic_patterns",
+            "code_patterns",
+        ):
+            patterns = getattr(self, name)
+            self.prefilter_keys += [(name, i) for i in range(len(patterns))]
+            sources += patterns.sources
+        if self.env_var_re is not None:
+            self.prefilter_keys.append(("env_var_re", 0))
+            sources.append(self.env_var_re.pattern)
+        self.prefilter_db = _hyperscan_db(sources)
+        self.literal_prefilter = None
+        if self.prefilter_db is None:
+            self.literal_prefilter = _literal_automaton(sources)
 
     def check_command(self, raw_command: str, parsed_commands: list) -> CheckResult:
         """Not used for content check - use check_content instead."""
@@ -93,90 +401,91 @@ class CodeContentCheck(SecurityCheck):
 
         file_name = Path(file_path).name if file_path else "script"
 
-        # Track found patterns
-        network_found = []
-        sensitive_found = []
-        scanning_found = []
-        recon_found = []
-        dynamic_found = []
-        code_pattern_found = []
-        env_var_found = []
-
-        # Check network patterns
-        for pattern in self.network_patterns:
-            match = pattern.search(content)
-            if match:
-                network_found.append(self._find_line_context(content, match))
-
-        # Check sensitive access patterns
-        for pattern in self.sensitive_patterns:
-            match = pattern.search(content)
-            if match:
-                sensitive_found.append(self._find_line_context(content, match))
+        hits = self._prefilter(content)
 
-        # Check secret scanning patterns (dangerous by itself!)
-        for pattern in self.scanning_patterns:
-            match = pattern.search(content)
-            if match:
-                scanning_found.append(self._find_line_context(content, match))
+        # Only scanning, dynamic execution and network can lead to a finding;
+        # the remaining categories matter only alongside network access.
+        scanning_matches = self._scan(
+            "scanning_patterns", content, hits, self.MAX_LISTED_STANDALONE
+        )
+        dynamic_matches = self._scan(
+            "dynamic_patterns", content, hits, self.MAX_LISTED_STANDALONE
+        )
+        network_matches = self._scan(
+            "network_patterns", content, hits, self.MAX_LISTED
+        )
 
-        # Check system recon patterns
-        for pattern in self.recon_patterns:
-            match = pattern.search(content)
-            if match:
-                recon_found.append(self._find_line_context(content, match))
+        if not (scanning_matches or dynamic_matches or network_matches):
+            return self._allow()
 
-        # Check dynamic execution patterns (dangerous by itself!)
-        for pattern in self.dynamic_patterns:
-            match = pattern.search(content)
-            if match:
-                dynamic_found.append(self._find_line_context(content, match))
+        # Line context is only rendered for the finding that is reported
+        if network_matches:
+            sensitive_matches = self._scan(
+                "sensitive_patterns", content, hits, self.MAX_LISTED
+            )
 
-        # Check code patterns from config
-        for item in self.code_patterns:
-            match = item["pattern"].search(content)
-            if match:
+            # Check code patterns from config
+            code_pattern_found = []
+            for i, match in self._scan_indexed(
+                "code_patterns", content, hits, self.MAX_LISTED
+            ):
                 code_pattern_found.append({
                     "match": match.group(0),
-                    "description": item["description"],
+                    "description": self.code_descriptions[i],
                 })
 
-        # Check secret env var patterns
-        for pattern in self.env_var_patterns:
-            match = pattern.search(content)
-            if match:
-                env_var_found.append(match.group(0))
-
-        # EXFILTRATION RISK: network + sensitive access
-        if network_found and (sensitive_found or code_pattern_found or env_var_found):
-            return self._build_exfiltration_warning(
-                file_name,
-                network_found,
-                sensitive_found,
-                code_pattern_found,
-                env_var_found,
-            )
+            # Check secret env var patterns (first access of each variable)
+            env_var_found = []
+            if self.env_var_re is not None and (hits is None or "env_var_re" in hits):
+                seen_vars = set()
+                for match in self.env_var_re.finditer(content):
+                    if match["var"] not in seen_vars:
+                        seen_vars.add(match["var"])
+                        env_var_found.append(match.group(0))
+                        if len(env_var_found) == self.MAX_LISTED:
+                            break
+
+            # EXFILTRATION RISK: network + sensitive access
+            if sensitive_matches or code_pattern_found or env_var_found:
+                return self._build_exfiltration_warning(
+                    file_name,
+                    self._line_contexts(content, network_matches),
+                    self._line_contexts(content, sensitive_matches),
+                    code_pattern_found,
+                    env_var_found,
+                )
 
         # SECRET SCANNING: dangerous by itself
-        if scanning_found:
+        if scanning_matches:
             return self._ask(
                 reason=f"Script {file_name} contains secret scanning patterns",
-                guidance=self._format_scanning_warning(scanning_found),
+                guidance=self._format_scanning_warning(
+                    self._line_contexts(content, scanning_matches)
+                ),
             )
 
         # DYNAMIC EXECUTION: dangerous by itself
-        if dynamic_found:
+        if dynamic_matches:
             return self._ask(
                 reason=f"Script {file_name} uses dynamic code execution",
-                guidance=self._format_dynamic_warning(dynamic_found),
+                guidance=self._format_dynamic_warning(
+                    self._line_contexts(content, dynamic_matches)
+                ),
             )
 
         # SYSTEM RECON + NETWORK: could be data gathering
-        if network_found and recon_found:
-            return self._ask(
-                reason=f"Script {file_name} gathers system info with network access",
-                guidance=self._format_recon_warning(network_found, recon_found),
+        if network_matches:
+            recon_matches = self._scan(
+                "recon_patterns", content, hits, self.MAX_LISTED
             )
+            if recon_matches:
+                return self._ask(
+                    reason=f"Script {file_name} gathers system info with network access",
+                    guidance=self._format_recon_warning(
+                        self._line_contexts(content, network_matches),
+                        self._line_contexts(content, recon_matches),
+                    ),
+                )
 
         # All checks passed
         return self._allow()
@@ -192,24 +501,123 @@ class CodeContentCheck(SecurityCheck):
         """
         path = Path(file_path)
 
-        if not path.exists():
-            return self._allow()
-
         # Only check script files
-        if path.suffix not in (".py", ".sh", ".bash", ".rb", ".pl", ".js"):
+        if path.suffix not in SCRIPT_EXTENSIONS:
             return self._allow()
 
         try:
-            content = path.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
+            size = os.stat(path).st_size
+            with path.open("rb") as f:
+                head = f.read(self.MAX_SCAN_BYTES)
+        except OSError:
             return self._allow()
 
-        return self.check_content(content, file_path)
+        content = head.decode("utf-8", errors="ignore")
+        result = self.check_content(content, file_path)
+        if not result.is_allowed or size <= self.MAX_SCAN_BYTES:
+            return result
+
+        # Rest of the file was not scanned, so it can't be vouched for
+        return self._ask(
+            reason=(
+                f"Script {path.name} is too large to check fully "
+                f"({size} bytes, first {self.MAX_SCAN_BYTES} scanned)"
+            ),
+            guidance="Review the script manually before running it.",
+        )
+
+    def _prefilter(self, content: str) -> Optional[dict[str, set[int]]]:
+        """Find patterns that may match, in one pass.
+
+        Returns:
+            Mapping of pattern attribute name to indexes of its patterns
+            that may match, or None if no prefilter is available (every
+            pattern must be searched).
+        """
+        if self.prefilter_db is None:
+            return self._literal_prefilter(content)
+        hit_ids = set()
+
+        def on_match(expr_id, start, end, flags, context):
+            hit_ids.add(expr_id)
 
-    def _find_line_context(self, content: str, match: re.Match) -> str:
-        """Find the line number and context for a match."""
-        start = match.start()
-        line_num = content[:start].count("\n") + 1
+        self.prefilter_db.scan(
+            content.encode("utf-8", errors="replace"),
+            match_event_handler=on_match,
+        )
+        return self._group_hits(hit_ids)
+
+    def _literal_prefilter(self, content: str) -> Optional[dict[str, set[int]]]:
+        """Find patterns whose required literals occur in content."""
+        if self.literal_prefilter is None:
+            return None
+        automaton, always = self.literal_prefilter
+        hit_ids = set(always)
+        if len(automaton):
+            for _end, ids in automaton.iter(content):
+                hit_ids.update(ids)
+        return self._group_hits(hit_ids)
+
+    def _group_hits(self, hit_ids: Iterable[int]) -> dict[str, set[int]]:
+        """Group prefilter expression ids by pattern attribute name."""
+        hits: dict[str, set[int]] = {}
+        for expr_id in hit_ids:
+            name, i = self.prefilter_keys[expr_id]
+            hits.setdefault(name, set()).add(i)
+        return hits
+
+    def _scan_indexed(
+        self,
+        name: str,
+        content: str,
+        hits: Optional[dict[str, set[int]]] = None,
+        limit: Optional[int] = None,
+    ) -> list[tuple[int, re.Match]]:
+        """Search content with each pattern of attribute `name`.
+
+        Returns (pattern index, first match) pairs in config order, at
+        most `limit`.
+        """
+        patterns = getattr(self, name)
+        candidates = None
+        if hits is not None:
+            candidates = hits.get(name)
+            if not candidates:
+                return []
+        return patterns.first_matches(content, candidates, limit)
+
+    def _scan(
+        self,
+        name: str,
+        content: str,
+        hits: Optional[dict[str, set[int]]] = None,
+        limit: Optional[int] = None,
+    ) -> list[re.Match]:
+        """Search content with each pattern of attribute `name`.
+
+        Returns the first match of each pattern that matched, at most `limit`.
+        """
+        return [match for _, match in self._scan_indexed(name, content, hits, limit)]
+
+    def _line_contexts(self, content: str, matches: list[re.Match]) -> list:
+        """Format line context for each match.
+
+        Newline offsets are collected only up to the last match.
+        """
+        if not matches:
+            return []
+        end = max(match.start() for match in matches)
+        newlines = [m.start() for m in _NEWLINE_RE.finditer(content, 0, end)]
+        return [self._find_line_context(newlines, match) for match in matches]
+
+    def _find_line_context(self, newlines: list[int], match: re.Match) -> str:
+        """Find the line number and context for a match.
+
+        Args:
+            newlines: Sorted offsets of newline characters in the content.
+            match: Match to describe.
+        """
+        line_num = bisect.bisect_right(newlines, match.start()) + 1
         # Get the matched text
         matched = match.group(0)
         return f"{matched} (line {line_num})"
@@ -223,27 +631,21 @@ class CodeContentCheck(SecurityCheck):
         env_vars: list,
     ) -> CheckResult:
         """Build exfiltration risk warning."""
-        parts = [f"EXFILTRATION RISK: {file_name} contains:"]
-
-        parts.append("  Network calls:")
-        for n in network[:3]:  # Limit to 3
-            parts.append(f"    - {n}")
-
+        limit = self.MAX_LISTED
+        parts = [
+            f"EXFILTRATION RISK: {file_name} contains:",
+            "  Network calls:",
+            *_bullets(network[:limit]),
+        ]
         if sensitive:
-            parts.append("  Sensitive file access:")
-            for s in sensitive[:3]:
-                parts.append(f"    - {s}")
-
+            parts += ["  Sensitive file access:", *_bullets(sensitive[:limit])]
         if code_patterns:
-            parts.append("  Secret access patterns:")
-            for p in code_patterns[:3]:
-                parts.append(f"    - {p['description']}: {p['match']}")
-
+            parts += [
+                "  Secret access patterns:",
+                *_bullets(f"{p['description']}: {p['match']}" for p in code_patterns[:limit]),
+            ]
         if env_vars:
-            parts.append("  Secret env vars:")
-            for e in env_vars[:3]:
-                parts.append(f"    - {e}")
-
+            parts += ["  Secret env vars:", *_bullets(env_vars[:limit])]
         parts.append("\nThis could be an attempt to send your secrets externally.")
 
         return self._ask(
@@ -253,28 +655,27 @@ class CodeContentCheck(SecurityCheck):
 
     def _format_scanning_warning(self, patterns: list) -> str:
         """Format secret scanning warning."""
-        lines = ["Script searches for secrets/passwords:"]
-        for p in patterns[:5]:
-            lines.append(f"  - {p}")
-        lines.append("\nThis could be attempting to find and collect credentials.")
-        return "\n".join(lines)
+        return "\n".join([
+            "Script searches for secrets/passwords:",
+            *_bullets(patterns[:self.MAX_LISTED_STANDALONE], "  - "),
+            "\nThis could be attempting to find and collect credentials.",
+        ])
 
     def _format_dynamic_warning(self, patterns: list) -> str:
         """Format dynamic execution warning."""
-        lines = ["Script uses dynamic code execution:"]
-        for p in patterns[:5]:
-            lines.append(f"  - {p}")
-        lines.append("\nexec/eval/compile can hide malicious code.")
-        return "\n".join(lines)
+        return "\n".join([
+            "Script uses dynamic code execution:",
+            *_bullets(patterns[:self.MAX_LISTED_STANDALONE], "  - "),
+            "\nexec/eval/compile can hide malicious code.",
+        ])
 
     def _format_recon_warning(self, network: list, recon: list) -> str:
         """Format reconnaissance warning."""
-        lines = ["Script gathers system info with network access:"]
-        lines.append("  Network:")
-        for n in network[:3]:
-            lines.append(f"    - {n}")
-        lines.append("  System info:")
-        for r in recon[:3]:
-            lines.append(f"    - {r}")
-        lines.append("\nCould be fingerprinting your system.")
-        return "\n".join(lines)
+        return "\n".join([
+            "Script gathers system info with network access:",
+            "  Network:",
+            *_bullets(network[:self.MAX_LISTED]),
+            "  System info:",
+            *_bullets(recon[:self.MAX_LISTED]),
+            "\nCould be fingerprinting your system.",
+        ])
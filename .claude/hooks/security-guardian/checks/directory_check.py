@@ -24,6 +24,8 @@ class DirectoryCheck(SecurityCheck):
     def __init__(self, config):
         super().__init__(config)
         self.project_root = self._get_project_root()
+        # Canonical root, resolved once instead of on every path check
+        self._resolved_root = self.project_root.resolve()
         self.allowed_paths = config.directories.allowed_paths
 
     def _get_project_root(self) -> Path:
@@ -66,6 +68,11 @@ class DirectoryCheck(SecurityCheck):
         # Resolve path relative to project root (not cwd, which may be security-guardian dir)
         resolved = resolve_path(path, base_dir=self.project_root)
 
+        # Fast path: inside the project after full resolution, so neither a
+        # symlink escape nor an allowed_paths match needs to be looked up
+        if resolved.is_relative_to(self._resolved_root):
+            return self._allow()
+
         # Check for symlink escape - HARD DENY (security bypass)
         if is_symlink_escape(path, self.project_root, base_dir=self.project_root):
             return self._deny(
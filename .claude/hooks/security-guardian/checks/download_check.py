@@ -2,6 +2,7 @@
 
 import json
 import os
+import re
 from pathlib import Path
 from typing import Optional
 
@@ -10,6 +11,20 @@ from parsers.bash_parser import ParsedCommand, is_pipe_to_shell
 from parsers.path_parser import get_project_root, resolve_path
 
 
+def _suffix_re(suffixes) -> Optional[re.Pattern]:
+    """Compile one regex matching strings that end with any of the suffixes.
+
+    Args:
+        suffixes: Extensions such as ".py" or ".tar.gz".
+
+    Returns:
+        Compiled pattern for use with search(), or None if there are no suffixes.
+    """
+    if not suffixes:
+        return None
+    return re.compile(r"(?:%s)\Z" % "|".join(map(re.escape, suffixes)))
+
+
 class DownloadCheck(SecurityCheck):
     """Check for dangerous download operations."""
 
@@ -22,6 +37,10 @@ class DownloadCheck(SecurityCheck):
         super().__init__(config)
         self.project_root = get_project_root()
         self._downloaded_files: Optional[dict] = None
+        self._auto_download_re = _suffix_re(config.download_protection.auto_download)
+        self._auto_with_check_re = _suffix_re(
+            config.download_protection.auto_download_but_check_unpack
+        )
 
     # Scripts that will be checked by CodeContentCheck on execution
     SCRIPT_EXTENSIONS = {".py", ".sh", ".bash", ".rb", ".pl", ".js"}
@@ -29,6 +48,10 @@ class DownloadCheck(SecurityCheck):
     # Binary executables that can't be content-checked
     BINARY_EXTENSIONS = {".exe", ".app", ".dmg", ".pkg", ".deb", ".bin", ".msi"}
 
+    # One alternation per class instead of an endswith() loop per extension
+    _SCRIPT_EXT_RE = _suffix_re(SCRIPT_EXTENSIONS)
+    _BINARY_EXT_RE = _suffix_re(BINARY_EXTENSIONS)
+
     def check_command(
         self,
         raw_command: str,
@@ -37,7 +60,7 @@ class DownloadCheck(SecurityCheck):
         """Check download commands for safety."""
         # First check for pipe to shell (always HARD DENY)
         shell_targets = self.config.bypass_prevention.block_shell_pipe_targets
-        if is_pipe_to_shell(parsed_commands, shell_targets):
+        if "|" in raw_command and is_pipe_to_shell(parsed_commands, shell_targets):
             return self._deny(
                 reason="Downloading and piping to shell detected",
                 guidance="Cannot pipe downloads to shell. Download file, review, then run.",
@@ -65,34 +88,32 @@ class DownloadCheck(SecurityCheck):
 
         # Scripts (.py, .sh, etc.) - ALLOW
         # They will be checked by CodeContentCheck when executed
-        if extension:
-            for script_ext in self.SCRIPT_EXTENSIONS:
-                if extension.endswith(script_ext):
-                    # Track for execution check
-                    if self.config.download_protection.track_downloaded_executables:
-                        self._track_downloaded_file(url, output_path)
-                    return self._allow()
+        if extension and self._SCRIPT_EXT_RE.search(extension):
+            # Track for execution check
+            if self.config.download_protection.track_downloaded_executables:
+                self._track_downloaded_file(url, output_path)
+            return self._allow()
 
         # Binary executables - ASK (can't content-check them)
-        if extension:
-            for binary_ext in self.BINARY_EXTENSIONS:
-                if extension.endswith(binary_ext):
-                    return self._ask(
-                        reason=f"Download of binary executable: *{extension}",
-                        guidance=(
-                            f"Binary files cannot be content-checked. "
-                            f"Give user the command: `{cmd.command} {' '.join(cmd.flags)} {' '.join(cmd.args)}`"
-                        ),
-                    )
+        if extension and self._BINARY_EXT_RE.search(extension):
+            return self._ask(
+                reason=f"Download of binary executable: *{extension}",
+                guidance=(
+                    f"Binary files cannot be content-checked. "
+                    f"Give user the command: `{cmd.command} {' '.join(cmd.flags)} {' '.join(cmd.args)}`"
+                ),
+            )
 
         # Auto-download data files are allowed
-        auto_download = self.config.download_protection.auto_download
-        if extension and any(ext for ext in auto_download if extension.endswith(ext)):
+        if extension and self._auto_download_re and self._auto_download_re.search(extension):
             return self._allow()
 
         # Archives can be downloaded but will be checked on unpack
-        auto_with_check = self.config.download_protection.auto_download_but_check_unpack
-        if extension and any(ext for ext in auto_with_check if extension.endswith(ext)):
+        if (
+            extension
+            and self._auto_with_check_re
+            and self._auto_with_check_re.search(extension)
+        ):
             return self._allow()
 
         # Unknown extension - allow but track for execution check
@@ -1,13 +1,36 @@
 """Secrets protection check - additional layer for files inside project."""
 
 import fnmatch
-from pathlib import Path
+import os
+import re
+from typing import Optional
 
 from checks.base import CheckResult, SecurityCheck
 from parsers.bash_parser import ParsedCommand, extract_paths_from_command
 from parsers.path_parser import get_project_root, resolve_path
 
 
+def _compile_globs(patterns: list[str]) -> Optional[re.Pattern]:
+    """Compile fnmatch patterns into a single regex.
+
+    Args:
+        patterns: Glob patterns, matched like fnmatch.fnmatch().
+
+    Returns:
+        Compiled alternation for use with match(), or None if no patterns.
+    """
+    if not patterns:
+        return None
+    return re.compile(
+        "|".join(fnmatch.translate(os.path.normcase(p)) for p in patterns)
+    )
+
+
+def _strip_any_dir(pattern: str) -> str:
+    """Remove the **/ prefix, which fnmatch has no notion of."""
+    return pattern[3:] if pattern.startswith("**/") else pattern
+
+
 class SecretsCheck(SecurityCheck):
     """Check for access to secret/sensitive files inside project."""
 
@@ -17,6 +40,16 @@ class SecretsCheck(SecurityCheck):
         super().__init__(config)
         self.project_root = get_project_root()
 
+        # Protected-path globs, compiled once instead of fnmatch'ed per pattern
+        no_read = config.protected_paths.no_read_content
+        self._no_read_allowed = _compile_globs(
+            [_strip_any_dir(p[1:]) for p in no_read if p.startswith("!")]
+        )
+        self._no_read_blocked = _compile_globs(
+            [_strip_any_dir(p) for p in no_read if not p.startswith("!")]
+        )
+        self._no_modify = _compile_globs(config.protected_paths.no_modify)
+
     def check_command(
         self,
         raw_command: str,
@@ -91,43 +124,21 @@ class SecretsCheck(SecurityCheck):
 
     def _matches_no_read(self, rel_path: str) -> bool:
         """Check if path matches no_read_content patterns."""
-        patterns = self.config.protected_paths.no_read_content
-
-        # Get just the filename for simple matching
-        filename = Path(rel_path).name
-
-        # First check negation patterns (they take precedence)
-        for pattern in patterns:
-            if pattern.startswith("!"):
-                negated = pattern[1:]
-                # Remove **/ prefix for fnmatch
-                if negated.startswith("**/"):
-                    negated = negated[3:]
-                if fnmatch.fnmatch(filename, negated) or fnmatch.fnmatch(rel_path, negated):
-                    return False  # Explicitly allowed
-
-        # Then check blocking patterns
-        for pattern in patterns:
-            if not pattern.startswith("!"):
-                # Remove **/ prefix for fnmatch
-                clean_pattern = pattern
-                if clean_pattern.startswith("**/"):
-                    clean_pattern = clean_pattern[3:]
-                # Match against filename or full relative path
-                if fnmatch.fnmatch(filename, clean_pattern) or fnmatch.fnmatch(rel_path, clean_pattern):
-                    return True
-
-        return False
+        # Match against just the filename or the full relative path
+        rel_path = os.path.normcase(rel_path)
+        filename = os.path.basename(rel_path)
 
-    def _matches_no_modify(self, rel_path: str) -> bool:
-        """Check if path matches no_modify patterns."""
-        patterns = self.config.protected_paths.no_modify
+        # Negation patterns take precedence
+        allowed = self._no_read_allowed
+        if allowed and (allowed.match(filename) or allowed.match(rel_path)):
+            return False  # Explicitly allowed
 
-        for pattern in patterns:
-            if fnmatch.fnmatch(rel_path, pattern):
-                return True
+        blocked = self._no_read_blocked
+        return bool(blocked and (blocked.match(filename) or blocked.match(rel_path)))
 
-        return False
+    def _matches_no_modify(self, rel_path: str) -> bool:
+        """Check if path matches no_modify patterns."""
+        return bool(self._no_modify and self._no_modify.match(os.path.normcase(rel_path)))
 
     def _get_secrets_guidance(self, path: str, rel_path: str) -> str:
         """Get appropriate guidance for secrets access."""
@@ -1,9 +1,11 @@
 """Base handler class for tool processing."""
 
+import weakref
 from abc import ABC, abstractmethod
+from functools import cached_property
 from typing import Any
 
-from checks.base import CheckResult, CheckStatus
+from checks.base import CheckResult, CheckStatus, SecurityCheck
 
 
 class ToolHandler(ABC):
@@ -11,6 +13,12 @@ class ToolHandler(ABC):
 
     tool_name: str = "base"
 
+    # Check instances shared between handlers, keyed by (check class, id(config)).
+    # Each check holds its config, so an id can't be reused while its entry lives.
+    _shared_checks: "weakref.WeakValueDictionary[tuple, SecurityCheck]" = (
+        weakref.WeakValueDictionary()
+    )
+
     def __init__(self, config: Any):
         """Initialize handler with configuration.
 
@@ -19,6 +27,25 @@ class ToolHandler(ABC):
         """
         self.config = config
 
+    def _shared_check(self, check_class: type) -> SecurityCheck:
+        """Get a check instance shared by all handlers using the same config.
+
+        Only for checks that don't capture per-call state such as the
+        project root. Configs must not be mutated after first use.
+
+        Args:
+            check_class: SecurityCheck subclass to instantiate.
+
+        Returns:
+            Shared check instance.
+        """
+        key = (check_class, id(self.config))
+        check = ToolHandler._shared_checks.get(key)
+        if check is None:
+            check = check_class(self.config)
+            ToolHandler._shared_checks[key] = check
+        return check
+
     @abstractmethod
     def handle(self, tool_input: dict[str, Any]) -> CheckResult:
         """Handle a tool invocation.
@@ -31,10 +58,15 @@ class ToolHandler(ABC):
         """
         pass
 
-    def _allow(self) -> CheckResult:
-        """Create an allow result."""
+    @cached_property
+    def _allow_result(self) -> CheckResult:
+        """Allow result shared by all calls on this handler."""
         return CheckResult(status=CheckStatus.ALLOW)
 
+    def _allow(self) -> CheckResult:
+        """Get the (shared) allow result."""
+        return self._allow_result
+
     def _block(self, reason: str, guidance: str = "") -> CheckResult:
         """Create a block result."""
         return CheckResult(
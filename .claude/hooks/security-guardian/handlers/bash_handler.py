@@ -18,22 +18,35 @@ from checks import (
 from parsers.bash_parser import parse_bash_command, ParsedCommand
 
 
-# Pattern to detect script execution commands
-SCRIPT_EXECUTION_PATTERNS = [
-    # Python
-    re.compile(r"^python3?\s+(.+\.py)\b"),
-    re.compile(r"^python3?\s+-m\s+"),  # module execution
-    # Bash/Shell
-    re.compile(r"^(?:ba)?sh\s+(.+\.sh)\b"),
-    re.compile(r"^source\s+(.+\.sh)\b"),
-    re.compile(r"^\.\s+(.+\.sh)\b"),
-    # Ruby
-    re.compile(r"^ruby\s+(.+\.rb)\b"),
-    # Perl
-    re.compile(r"^perl\s+(.+\.pl)\b"),
-    # Node
-    re.compile(r"^node\s+(.+\.js)\b"),
-]
+# Pattern to detect script execution commands (used with match(), so it is
+# anchored at the start). One alternation with a single capturing group per
+# interpreter, so each command is scanned once. `python -m module` has no
+# script path and falls through to the argument scan in _extract_script_path.
+SCRIPT_EXECUTION_RE = re.compile(
+    r"(?:"
+    r"python3?\s+(.+\.py)\b"         # Python
+    r"|(?:ba)?sh\s+(.+\.sh)\b"       # Bash/Shell
+    r"|source\s+(.+\.sh)\b"
+    r"|\.\s+(.+\.sh)\b"
+    r"|ruby\s+(.+\.rb)\b"            # Ruby
+    r"|perl\s+(.+\.pl)\b"            # Perl
+    r"|node\s+(.+\.js)\b"            # Node
+    r")"
+)
+
+# Interpreters whose script arguments are content-checked
+SCRIPT_INTERPRETERS = frozenset({"python", "python3", "bash", "sh", "ruby", "perl", "node"})
+
+# Script suffixes as a tuple for str.endswith
+SCRIPT_SUFFIXES = (".py", ".sh", ".bash", ".rb", ".pl", ".js")
+
+# Read-only commands that no check can object to: no paths, no long options
+# (e.g. `git diff --output=FILE`), no chaining, substitution or redirection.
+# Anything else goes through the full pipeline.
+SAFE_COMMAND_RE = re.compile(
+    r"(?:pwd|ls(?:[ \t]+-[A-Za-z1]+)*"
+    r"|git[ \t]+(?:(?:status|diff|log)(?:[ \t]+-[A-Za-z]+)*|branch))[ \t]*"
+)
 
 
 class BashHandler(ToolHandler):
@@ -57,7 +70,7 @@ class BashHandler(ToolHandler):
             ExecutionCheck(config),    # Execution protection
             SecretsCheck(config),      # Secrets protection
         ]
-        self.code_content_check = CodeContentCheck(config)
+        self.code_content_check = self._shared_check(CodeContentCheck)
 
     def handle(self, tool_input: dict[str, Any]) -> CheckResult:
         """Handle a Bash tool invocation.
@@ -69,8 +82,14 @@ class BashHandler(ToolHandler):
             CheckResult with status and guidance.
         """
         command = tool_input.get("command", "")
+        stripped = command.strip() if command else ""
+
+        # Empty or whitespace-only commands are allowed without parsing
+        if not stripped:
+            return self._allow()
 
-        if not command or not command.strip():
+        # Fast path for trivially safe commands (skips parsing and all checks)
+        if SAFE_COMMAND_RE.fullmatch(stripped):
             return self._allow()
 
         # Parse command
@@ -129,15 +148,14 @@ class BashHandler(ToolHandler):
         if cmd.args:
             full_cmd = f"{cmd.command} {' '.join(cmd.args)}"
 
-        for pattern in SCRIPT_EXECUTION_PATTERNS:
-            match = pattern.search(full_cmd)
-            if match and match.lastindex:
-                return match.group(1)
+        match = SCRIPT_EXECUTION_RE.match(full_cmd)
+        if match:
+            return match.group(match.lastindex)
 
         # Also check direct execution of .py/.sh files via arguments
-        if cmd.command in ("python", "python3", "bash", "sh", "ruby", "perl", "node"):
+        if cmd.command in SCRIPT_INTERPRETERS:
             for arg in cmd.args:
-                if arg.endswith((".py", ".sh", ".bash", ".rb", ".pl", ".js")):
+                if arg.endswith(SCRIPT_SUFFIXES):
                     return arg
 
         return None
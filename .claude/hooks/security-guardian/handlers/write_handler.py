@@ -1,6 +1,6 @@
 """Write/Edit tool handler."""
 
-from pathlib import Path
+import os
 from typing import Any
 
 from handlers.base import ToolHandler, CheckResult
@@ -20,7 +20,7 @@ class WriteHandler(ToolHandler):
         super().__init__(config)
         self.directory_check = DirectoryCheck(config)
         self.secrets_check = SecretsCheck(config)
-        self.code_content_check = CodeContentCheck(config)
+        self.code_content_check = self._shared_check(CodeContentCheck)
 
     def handle(self, tool_input: dict[str, Any]) -> CheckResult:
         """Handle a Write/Edit tool invocation.
@@ -57,7 +57,7 @@ class WriteHandler(ToolHandler):
 
     def _is_script_file(self, file_path: str) -> bool:
         """Check if file is a script that needs content checking."""
-        suffix = Path(file_path).suffix.lower()
+        suffix = os.path.splitext(file_path)[1].lower()
         return suffix in SCRIPT_EXTENSIONS
 
 
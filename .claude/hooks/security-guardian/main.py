@@ -57,6 +57,17 @@ def setup_logging(config) -> logging.Logger:
     return logger
 
 
+HANDLER_CLASSES = {
+    "Bash": BashHandler,
+    "Read": ReadHandler,
+    "Write": WriteHandler,
+    "Edit": EditHandler,
+    "NotebookEdit": NotebookEditHandler,
+    "Glob": GlobGrepHandler,
+    "Grep": GrepHandler,
+}
+
+
 def get_handler(tool_name: str, config):
     """Get appropriate handler for tool.
 
@@ -67,17 +78,7 @@ def get_handler(tool_name: str, config):
     Returns:
         Handler instance or None if tool is not handled.
     """
-    handlers = {
-        "Bash": BashHandler,
-        "Read": ReadHandler,
-        "Write": WriteHandler,
-        "Edit": EditHandler,
-        "NotebookEdit": NotebookEditHandler,
-        "Glob": GlobGrepHandler,
-        "Grep": GrepHandler,
-    }
-
-    handler_class = handlers.get(tool_name)
+    handler_class = HANDLER_CLASSES.get(tool_name)
     if handler_class:
         return handler_class(config)
     return None
@@ -147,14 +148,14 @@ def main():
     # Claude Code reads stdout for JSON decisions
     decision = result.permission_decision
 
-    if decision == PermissionDecision.DENY:
+    if decision is PermissionDecision.DENY:
         output = {
             "permissionDecision": "deny",
             "message": format_block_message(result),
         }
         print(json.dumps(output))
         sys.exit(0)  # exit 0 so Claude Code processes JSON
-    elif decision == PermissionDecision.ASK:
+    elif decision is PermissionDecision.ASK:
         output = {
             "permissionDecision": "ask",
             "message": format_confirm_message(result),
@@ -1,5 +1,7 @@
 """Bash command parser using bashlex AST."""
 
+import functools
+import re
 from dataclasses import dataclass, field
 from typing import Optional
 
@@ -9,10 +11,18 @@ try:
 except ImportError:
     BASHLEX_AVAILABLE = False
 
+# Characters that give a command shell structure beyond whitespace-separated
+# words: pipes, lists, redirects, expansions, quoting, grouping, negation,
+# comments. Commands without them parse to exactly their whitespace split.
+_SHELL_META_RE = re.compile(r"[|&;<>()$`\\\"'!{}#\n\r]")
+
 
 @dataclass
 class ParsedCommand:
-    """Represents a parsed bash command."""
+    """Represents a parsed bash command.
+
+    Parse results are cached and shared, so treat instances as read-only.
+    """
 
     command: str
     args: list[str] = field(default_factory=list)
@@ -132,7 +142,15 @@ def parse_bash_command(command: str) -> list[ParsedCommand]:
     if not command or not command.strip():
         return []
 
-    command = command.strip()
+    return list(_parse_cached(command.strip()))
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_cached(command: str) -> tuple[ParsedCommand, ...]:
+    """Parse a stripped command string (memoized by command text)."""
+    # Plain words only: skip building the bashlex AST
+    if not _SHELL_META_RE.search(command):
+        return tuple(_simple_parse(command))
 
     if BASHLEX_AVAILABLE:
         try:
@@ -140,13 +158,13 @@ def parse_bash_command(command: str) -> list[ParsedCommand]:
             commands = []
             for part in parts:
                 commands.extend(_parse_node(part, command))
-            return commands
+            return tuple(commands)
         except Exception:
             # Fall back to simple parsing on bashlex error
             pass
 
     # Simple fallback parsing
-    return _simple_parse(command)
+    return tuple(_simple_parse(command))
 
 
 def _simple_parse(command: str) -> list[ParsedCommand]:
@@ -79,23 +79,12 @@ def is_path_within_allowed(
     # Resolve project root too
     project_root = project_root.resolve()
 
-    # Check if within project
-    try:
-        path.relative_to(project_root)
+    # Check if within project (component-wise, so /proj-other is not in /proj)
+    if path.is_relative_to(project_root):
         return True
-    except ValueError:
-        pass
 
     # Check allowed paths
-    for allowed in allowed_paths:
-        allowed_path = resolve_path(allowed)
-        try:
-            path.relative_to(allowed_path)
-            return True
-        except ValueError:
-            continue
-
-    return False
+    return any(path.is_relative_to(resolve_path(allowed)) for allowed in allowed_paths)
 
 
 def is_symlink_escape(
@@ -122,11 +111,8 @@ def is_symlink_escape(
     project_resolved = project_root.resolve()
 
     # Check if resolved path is within project
-    try:
-        resolved.relative_to(project_resolved)
+    if resolved.is_relative_to(project_resolved):
         return False  # Path is within project after resolution - no escape
-    except ValueError:
-        pass
 
     # Path is outside project after resolution - check if this is due to
     # a symlink WITHIN the project pointing outside (which is an escape)
@@ -150,19 +136,13 @@ def is_symlink_escape(
         for part in original_normalized.parts[1:]:  # Skip root
             check_path = check_path / part
 
-            # Check if we've entered the project directory
-            try:
-                check_path.resolve().relative_to(project_resolved)
+            # Check if we've entered the project directory (once inside, stay inside)
+            if not inside_project and check_path.resolve().is_relative_to(project_resolved):
                 inside_project = True
-            except ValueError:
-                pass
 
             # If we're inside the project and hit a symlink that goes outside, it's an escape
             if inside_project and check_path.exists() and check_path.is_symlink():
-                target = check_path.resolve()
-                try:
-                    target.relative_to(project_resolved)
-                except ValueError:
+                if not check_path.resolve().is_relative_to(project_resolved):
                     # Symlink inside project points outside - this is an escape
                     return True
 
@@ -30,9 +30,32 @@ def temp_project_dir():
             os.environ.pop("CLAUDE_PROJECT_DIR", None)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def shared_project_dir(tmp_path_factory):
+    """Create a project directory shared by all tests in a module.
+
+    For tests that only need an existing project path. Tests that create
+    files, directories or symlinks should use temp_project_dir instead.
+    """
+    project_dir = tmp_path_factory.mktemp("project")
+    (project_dir / ".git").mkdir()
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("CLAUDE_PROJECT_DIR", str(project_dir))
+        yield project_dir
+
+
+@pytest.fixture(scope="module")
+def sample_file(shared_project_dir):
+    """Create an empty file inside the shared project directory."""
+    path = shared_project_dir / "test.txt"
+    path.touch()
+    return path
+
+
+@pytest.fixture(scope="session")
 def config():
-    """Load default configuration."""
+    """Load default configuration (shared; tests must not mutate it)."""
     return load_config()
 
 
@@ -6,6 +6,7 @@ from parsers.bash_parser import (
     extract_paths_from_command,
     get_git_subcommand_and_flags,
     is_pipe_to_shell,
+    _parse_node,
 )
 
 
@@ -54,6 +55,35 @@ class TestParseBashCommand:
         result = parse_bash_command("   ")
         assert len(result) == 0
 
+    def test_repeated_parse_is_cached(self):
+        """Same command text reuses parsed commands in a fresh list."""
+        first = parse_bash_command("git status && ls src")
+        second = parse_bash_command("  git status && ls src  ")
+        assert first is not second
+        assert first[0] is second[0]
+
+    @pytest.mark.parametrize(
+        "command",
+        [
+            "cat file.txt",
+            "ls -la /tmp",
+            "rm -rf ~/build *.pyc",
+            "git push --force origin main",
+            "FOO=bar make test",
+            "curl -o=out.sh http://example.com/x?a=b",
+            "python3 -m pytest tests/",
+            "echo a  b\tc",
+            "[ -f setup.py ]",
+        ],
+    )
+    def test_plain_words_match_bashlex(self, command):
+        """Commands without shell metacharacters skip bashlex with the same result."""
+        bashlex = pytest.importorskip("bashlex")
+        expected = []
+        for part in bashlex.parse(command):
+            expected.extend(_parse_node(part, command))
+        assert parse_bash_command(command) == expected
+
 
 class TestExtractPaths:
     """Tests for extract_paths_from_command function."""
@@ -8,8 +8,8 @@ from config import SecurityConfig
 from parsers.bash_parser import parse_bash_command
 
 
-@pytest.fixture
-def deletion_check(temp_project_dir, config):
+@pytest.fixture(scope="module")
+def deletion_check(shared_project_dir, config):
     """Create DeletionCheck with config."""
     return DeletionCheck(config)
 
@@ -33,18 +33,16 @@ class TestDeletionCheck:
         assert not result.is_allowed
         assert result.permission_decision == PermissionDecision.ASK
 
-    def test_rm_in_project_allowed(self, deletion_check, temp_project_dir):
+    def test_rm_in_project_allowed(self, deletion_check, sample_file):
         """Test that rm in project is allowed."""
-        test_file = temp_project_dir / "test.txt"
-        test_file.touch()
-
-        cmd = f"rm {test_file}"
+        cmd = f"rm {sample_file}"
         parsed = parse_bash_command(cmd)
         result = deletion_check.check_command(cmd, parsed)
         assert result.is_allowed
 
-    def test_rm_rf_node_modules_allowed(self, deletion_check, temp_project_dir):
+    def test_rm_rf_node_modules_allowed(self, temp_project_dir, config):
         """Test that rm -rf node_modules is allowed."""
+        deletion_check = DeletionCheck(config)
         node_modules = temp_project_dir / "node_modules"
         node_modules.mkdir()
 
@@ -53,19 +51,17 @@ class TestDeletionCheck:
         result = deletion_check.check_command(cmd, parsed)
         assert result.is_allowed
 
-    def test_rm_git_directory_asks(self, deletion_check, temp_project_dir):
+    def test_rm_git_directory_asks(self, deletion_check, shared_project_dir):
         """Test that rm -rf .git requires confirmation."""
-        git_dir = temp_project_dir / ".git"
-
-        cmd = f"rm -rf {git_dir}"
+        cmd = f"rm -rf {shared_project_dir}/.git"
         parsed = parse_bash_command(cmd)
         result = deletion_check.check_command(cmd, parsed)
         assert not result.is_allowed
         assert result.permission_decision == PermissionDecision.ASK
 
-    def test_rm_project_root_asks(self, deletion_check, temp_project_dir):
+    def test_rm_project_root_asks(self, deletion_check, shared_project_dir):
         """Test that rm -rf project root requires confirmation."""
-        cmd = f"rm -rf {temp_project_dir}"
+        cmd = f"rm -rf {shared_project_dir}"
         parsed = parse_bash_command(cmd)
         result = deletion_check.check_command(cmd, parsed)
         assert not result.is_allowed
@@ -9,10 +9,11 @@ import pytest
 from checks.directory_check import DirectoryCheck
 from checks.base import PermissionDecision
 from config import SecurityConfig
+from parsers.bash_parser import parse_bash_command
 
 
-@pytest.fixture
-def directory_check(temp_project_dir, config):
+@pytest.fixture(scope="module")
+def directory_check(shared_project_dir, config):
     """Create DirectoryCheck with temp project."""
     return DirectoryCheck(config)
 
@@ -20,13 +21,9 @@ def directory_check(temp_project_dir, config):
 class TestDirectoryCheck:
     """Tests for DirectoryCheck."""
 
-    def test_path_inside_project_allowed(self, directory_check, temp_project_dir):
+    def test_path_inside_project_allowed(self, directory_check, sample_file):
         """Test that paths inside project are allowed."""
-        # Create a file inside project
-        test_file = temp_project_dir / "test.txt"
-        test_file.touch()
-
-        result = directory_check.check_path(str(test_file), operation="cat")
+        result = directory_check.check_path(str(sample_file), operation="cat")
         assert result.is_allowed
 
     def test_path_outside_project_asks(self, directory_check):
@@ -42,14 +39,22 @@ class TestDirectoryCheck:
         assert not result.is_allowed
         assert result.permission_decision == PermissionDecision.ASK
 
+    def test_sibling_with_shared_prefix_asks(self, directory_check, shared_project_dir):
+        """Test that a sibling dir sharing the root's name prefix is outside."""
+        sibling = f"{shared_project_dir}-other/file.txt"
+        result = directory_check.check_path(sibling, operation="cat")
+        assert not result.is_allowed
+        assert result.permission_decision == PermissionDecision.ASK
+
     def test_home_directory_asks(self, directory_check):
         """Test that home directory access requires confirmation."""
         result = directory_check.check_path("~/notes.txt", operation="cat")
         assert not result.is_allowed
         assert result.permission_decision == PermissionDecision.ASK
 
-    def test_symlink_escape_denied(self, directory_check, temp_project_dir):
+    def test_symlink_escape_denied(self, temp_project_dir, config):
         """Test that symlink escape is hard denied (security bypass)."""
+        directory_check = DirectoryCheck(config)
         # Create a symlink pointing outside project
         link_path = temp_project_dir / "escape_link"
         try:
@@ -65,21 +70,14 @@ class TestDirectoryCheck:
 
     def test_command_with_outside_path_asks(self, directory_check, config):
         """Test command that accesses outside path requires confirmation."""
-        from parsers.bash_parser import parse_bash_command
-
         parsed = parse_bash_command("cat /home/user/secret.txt")
         result = directory_check.check_command("cat /home/user/secret.txt", parsed)
         assert not result.is_allowed
         assert result.permission_decision == PermissionDecision.ASK
 
-    def test_command_inside_project_allowed(self, directory_check, temp_project_dir):
+    def test_command_inside_project_allowed(self, directory_check, sample_file):
         """Test command inside project is allowed."""
-        from parsers.bash_parser import parse_bash_command
-
-        test_file = temp_project_dir / "file.txt"
-        test_file.touch()
-
-        cmd = f"cat {test_file}"
+        cmd = f"cat {sample_file}"
         parsed = parse_bash_command(cmd)
         result = directory_check.check_command(cmd, parsed)
         assert result.is_allowed
@@ -8,7 +8,7 @@ from config import SecurityConfig
 from parsers.bash_parser import parse_bash_command
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def download_check(config):
     """Create DownloadCheck with config."""
     return DownloadCheck(config)
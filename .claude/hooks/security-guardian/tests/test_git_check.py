@@ -8,7 +8,7 @@ from config import SecurityConfig
 from parsers.bash_parser import parse_bash_command
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def git_check(config):
     """Create GitCheck with config."""
     return GitCheck(config)
@@ -2,34 +2,36 @@
 
 import pytest
 
-from handlers.bash_handler import BashHandler
+from handlers.bash_handler import BashHandler, SAFE_COMMAND_RE
 from handlers.read_handler import ReadHandler
 from handlers.write_handler import WriteHandler
 from handlers.glob_grep_handler import GlobGrepHandler
 from checks.base import PermissionDecision
+from parsers.bash_parser import parse_bash_command
 from config import SecurityConfig
+from main import get_handler
 
 
-@pytest.fixture
-def bash_handler(temp_project_dir, config):
+@pytest.fixture(scope="module")
+def bash_handler(shared_project_dir, config):
     """Create BashHandler with config."""
     return BashHandler(config)
 
 
-@pytest.fixture
-def read_handler(temp_project_dir, config):
+@pytest.fixture(scope="module")
+def read_handler(shared_project_dir, config):
     """Create ReadHandler with config."""
     return ReadHandler(config)
 
 
-@pytest.fixture
-def write_handler(temp_project_dir, config):
+@pytest.fixture(scope="module")
+def write_handler(shared_project_dir, config):
     """Create WriteHandler with config."""
     return WriteHandler(config)
 
 
-@pytest.fixture
-def glob_handler(temp_project_dir, config):
+@pytest.fixture(scope="module")
+def glob_handler(shared_project_dir, config):
     """Create GlobGrepHandler with config."""
     return GlobGrepHandler(config)
 
@@ -37,12 +39,9 @@ def glob_handler(temp_project_dir, config):
 class TestBashHandler:
     """Tests for BashHandler."""
 
-    def test_handle_safe_command(self, bash_handler, temp_project_dir):
+    def test_handle_safe_command(self, bash_handler, sample_file):
         """Test handling safe command."""
-        test_file = temp_project_dir / "test.txt"
-        test_file.touch()
-
-        result = bash_handler.handle({"command": f"cat {test_file}"})
+        result = bash_handler.handle({"command": f"cat {sample_file}"})
         assert result.is_allowed
 
     def test_handle_dangerous_command(self, bash_handler):
@@ -57,6 +56,64 @@ class TestBashHandler:
         result = bash_handler.handle({"command": ""})
         assert result.is_allowed
 
+    @pytest.mark.parametrize("command", ["", "   ", "\n\t"])
+    def test_empty_command_skips_parsing(self, bash_handler, monkeypatch, command):
+        """Empty and whitespace-only commands never reach the parser."""
+
+        def fail(_command):
+            raise AssertionError("parser called")
+
+        monkeypatch.setattr("handlers.bash_handler.parse_bash_command", fail)
+        assert bash_handler.handle({"command": command}).is_allowed
+
+    @pytest.mark.parametrize(
+        "command",
+        ["pwd", "ls", "ls -la", "git status", "git status -s", "git log -p", "git branch"],
+    )
+    def test_handle_fast_path_commands(self, bash_handler, command):
+        """Trivially safe commands take the fast path."""
+        assert SAFE_COMMAND_RE.fullmatch(command)
+        result = bash_handler.handle({"command": command})
+        assert result.is_allowed
+
+    @pytest.mark.parametrize(
+        "command",
+        [
+            "ls /etc",
+            "ls -la ~/.ssh",
+            "pwd; rm -rf /",
+            "ls\nrm -rf /",
+            "git diff --output=/tmp/x",
+            "git branch -D main",
+            "git log | sh",
+            "ls $(whoami)",
+        ],
+    )
+    def test_fast_path_rejects_unsafe_commands(self, command):
+        """Paths, long options and shell metacharacters skip the fast path."""
+        assert not SAFE_COMMAND_RE.fullmatch(command.strip())
+
+    @pytest.mark.parametrize(
+        "command,expected",
+        [
+            ("python script.py", "script.py"),
+            ("python3 tools/run.py --flag", "tools/run.py"),
+            ("bash deploy.sh", "deploy.sh"),
+            ("sh deploy.sh", "deploy.sh"),
+            ("source env.sh", "env.sh"),
+            (". env.sh", "env.sh"),
+            ("ruby app.rb", "app.rb"),
+            ("perl tool.pl", "tool.pl"),
+            ("node index.js", "index.js"),
+            ("echo python script.py", None),
+            ("ls", None),
+        ],
+    )
+    def test_extract_script_path(self, bash_handler, command, expected):
+        """Script paths are extracted only from interpreter invocations."""
+        cmd = parse_bash_command(command)[0]
+        assert bash_handler._extract_script_path(cmd) == expected
+
     def test_handle_git_force_push(self, bash_handler):
         """Test handling git push --force (hard deny)."""
         result = bash_handler.handle({"command": "git push --force origin main"})
@@ -64,15 +121,38 @@ class TestBashHandler:
         assert result.permission_decision == PermissionDecision.DENY
 
 
+class TestSharedChecks:
+    """Tests for check instances shared between handlers."""
+
+    def test_code_content_check_shared(self, config, shared_project_dir):
+        """Handlers with the same config share one CodeContentCheck."""
+        bash = BashHandler(config)
+        write = WriteHandler(config)
+        assert bash.code_content_check is write.code_content_check
+        assert BashHandler(config).code_content_check is bash.code_content_check
+
+    def test_code_content_check_per_config(self, config, minimal_config, shared_project_dir):
+        """Different configs get different CodeContentCheck instances."""
+        first = BashHandler(config)
+        second = BashHandler(minimal_config)
+        assert first.code_content_check is not second.code_content_check
+
+
+class TestGetHandler:
+    """Tests for main.get_handler."""
+
+    def test_handler_per_tool(self, config, shared_project_dir):
+        """Known tools get their handler, unknown tools get None."""
+        assert isinstance(get_handler("Bash", config), BashHandler)
+        assert get_handler("Unknown", config) is None
+
+
 class TestReadHandler:
     """Tests for ReadHandler."""
 
-    def test_handle_read_in_project(self, read_handler, temp_project_dir):
+    def test_handle_read_in_project(self, read_handler, sample_file):
         """Test reading file in project."""
-        test_file = temp_project_dir / "test.txt"
-        test_file.touch()
-
-        result = read_handler.handle({"file_path": str(test_file)})
+        result = read_handler.handle({"file_path": str(sample_file)})
         assert result.is_allowed
 
     def test_handle_read_outside_project(self, read_handler):
@@ -81,8 +161,9 @@ class TestReadHandler:
         assert not result.is_allowed
         assert result.permission_decision == PermissionDecision.ASK
 
-    def test_handle_read_env_file(self, read_handler, temp_project_dir):
+    def test_handle_read_env_file(self, temp_project_dir, config):
         """Test reading .env file (hard deny - secrets)."""
+        read_handler = ReadHandler(config)
         env_file = temp_project_dir / ".env"
         env_file.touch()
 
@@ -90,8 +171,9 @@ class TestReadHandler:
         assert not result.is_allowed
         assert result.permission_decision == PermissionDecision.DENY
 
-    def test_handle_read_env_example(self, read_handler, temp_project_dir):
+    def test_handle_read_env_example(self, temp_project_dir, config):
         """Test reading .env.example file."""
+        read_handler = ReadHandler(config)
         env_example = temp_project_dir / ".env.example"
         env_example.touch()
 
@@ -102,11 +184,9 @@ class TestReadHandler:
 class TestWriteHandler:
     """Tests for WriteHandler."""
 
-    def test_handle_write_in_project(self, write_handler, temp_project_dir):
+    def test_handle_write_in_project(self, write_handler, shared_project_dir):
         """Test writing file in project."""
-        test_file = temp_project_dir / "new_file.txt"
-
-        result = write_handler.handle({"file_path": str(test_file)})
+        result = write_handler.handle({"file_path": f"{shared_project_dir}/new_file.txt"})
         assert result.is_allowed
 
     def test_handle_write_outside_project(self, write_handler):
@@ -115,8 +195,9 @@ class TestWriteHandler:
         assert not result.is_allowed
         assert result.permission_decision == PermissionDecision.ASK
 
-    def test_handle_write_settings(self, write_handler, temp_project_dir):
+    def test_handle_write_settings(self, temp_project_dir, config):
         """Test writing settings.json (hard deny - protected)."""
+        write_handler = WriteHandler(config)
         settings = temp_project_dir / ".claude" / "settings.json"
         settings.parent.mkdir(parents=True, exist_ok=True)
 
@@ -128,9 +209,9 @@ class TestWriteHandler:
 class TestGlobHandler:
     """Tests for GlobGrepHandler."""
 
-    def test_handle_glob_in_project(self, glob_handler, temp_project_dir):
+    def test_handle_glob_in_project(self, glob_handler, shared_project_dir):
         """Test glob in project."""
-        result = glob_handler.handle({"path": str(temp_project_dir)})
+        result = glob_handler.handle({"path": str(shared_project_dir)})
         assert result.is_allowed
 
     def test_handle_glob_outside_project(self, glob_handler):
@@ -78,9 +78,9 @@ class TestProtectedPaths:
 
     def test_git_directory_protected(self, secrets_check, temp_project_dir):
         """Test that .git directory is protected."""
-        git_config = temp_project_dir / ".git" / "config"
+        git_config = f"{temp_project_dir}/.git/config"
 
-        result = secrets_check.check_path(str(git_config), operation="write")
+        result = secrets_check.check_path(git_config, operation="write")
         assert result.is_blocked
 
     def test_settings_json_protected(self, secrets_check, temp_project_dir):
@@ -100,3 +100,12 @@ class TestProtectedPaths:
 
         result = secrets_check.check_path(str(regular_file), operation="write")
         assert result.is_allowed
+
+    def test_no_patterns_configured(self, minimal_config, temp_project_dir):
+        """Test that nothing is protected when no patterns are configured."""
+        check = SecretsCheck(minimal_config)
+        env_file = temp_project_dir / ".env"
+        env_file.touch()
+
+        assert check.check_path(str(env_file), operation="cat").is_allowed
+        assert check.check_path(str(env_file), operation="write").is_allowed
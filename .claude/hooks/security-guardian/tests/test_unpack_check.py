@@ -8,8 +8,8 @@ from config import SecurityConfig
 from parsers.bash_parser import parse_bash_command
 
 
-@pytest.fixture
-def unpack_check(temp_project_dir, config):
+@pytest.fixture(scope="module")
+def unpack_check(shared_project_dir, config):
     """Create UnpackCheck with config."""
     return UnpackCheck(config)
 
@@ -65,9 +65,9 @@ class TestUnpackCheck:
         assert not result.is_allowed
         assert result.permission_decision == PermissionDecision.ASK
 
-    def test_tar_in_project_allowed(self, unpack_check, temp_project_dir):
+    def test_tar_in_project_allowed(self, unpack_check, shared_project_dir):
         """Test that tar in project is allowed."""
-        cmd = f"tar -xf archive.tar -C {temp_project_dir}"
+        cmd = f"tar -xf archive.tar -C {shared_project_dir}"
         parsed = parse_bash_command(cmd)
         result = unpack_check.check_command(cmd, parsed)
         assert result.is_allowed
@@ -140,13 +140,17 @@ if [ -n "$OUTPUT_DIR" ]; then
         [ "$NUM_IMAGES" -gt 1 ] && SUFFIX="_$INDEX"
         OUTPUT_PATH="$OUTPUT_DIR/${FILENAME}_${TIMESTAMP}${SUFFIX}.${OUTPUT_FORMAT}"
 
-        if curl -s -o "$OUTPUT_PATH" "$URL"; then
-            echo "Saved: $OUTPUT_PATH"
-        else
-            echo "Warning: Failed to download $URL"
-        fi
+        # Download in background: images are independent, fetch them concurrently
+        (
+            if curl -s -o "$OUTPUT_PATH" "$URL"; then
+                echo "Saved: $OUTPUT_PATH"
+            else
+                echo "Warning: Failed to download $URL"
+            fi
+        ) &
         INDEX=$((INDEX + 1))
     done
+    wait
     echo ""
 fi
 
@@ -1,7 +1,7 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.10"
-# dependencies = ["openpyxl"]
+# dependencies = ["orjson"]
 # ///
 """Missed demand analysis for Yandex Direct campaigns.
 
@@ -12,12 +12,22 @@ Subcommands:
   query-total  Get totalCount from Wordstat API
 """
 import argparse
+import functools
 import json
+import os
+import posixpath
 import sys
-import urllib.request
-import urllib.error
 import re
-from collections import OrderedDict
+import time
+
+# Subcommand-only modules (zipfile/ElementTree for parse-xlsx; http.client,
+# sqlite3, threads for query-total) are imported where used: each CLI call
+# is a fresh process, and build-query/merge-slots need none of them.
+
+try:
+    import orjson
+except ImportError:  # run without uv: fall back to stdlib json
+    orjson = None
 
 
 # --- Stop words that need + prefix in Wordstat queries ---
@@ -28,89 +38,245 @@ STOP_WORDS = frozenset([
 
 # Characters forbidden in slot variants (OR-syntax operators and leading modifiers)
 # Hyphen inside words is OK (б/у, санкт-петербург)
-FORBIDDEN_CHARS_RE = re.compile(r'[|()"]')
-LEADING_OPERATOR_RE = re.compile(r'^[+\-!]')
+FORBIDDEN_CHARS = '|()"'
+LEADING_OPERATORS = "+-!"
 # Punctuation to strip from slot variants (dots, commas, semicolons, etc.)
 # Keeps hyphens (б/у, санкт-петербург), slashes, and ! (Wordstat exact form operator)
-PUNCTUATION_RE = re.compile(r'[.,;:?…·•]')
+PUNCTUATION_CHARS = ".,;:?…·•"
+# One str.translate pass: drop punctuation, forbidden chars -> space (keeps tokens apart)
+SANITIZE_TABLE = str.maketrans(
+    {**dict.fromkeys(PUNCTUATION_CHARS), **dict.fromkeys(FORBIDDEN_CHARS, " ")}
+)
+SANITIZE_CHARS = frozenset(PUNCTUATION_CHARS + FORBIDDEN_CHARS)
+PUNCTUATION_TABLE = str.maketrans("", "", PUNCTUATION_CHARS)
+FORBIDDEN_TABLE = str.maketrans("", "", FORBIDDEN_CHARS)
+
+
+def json_loads(raw):
+    """Parse JSON from str or bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def print_json(result, pretty=False):
+    """Write result to stdout as JSON: compact, or indented with --pretty."""
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(result, option=option))
+        sys.stdout.buffer.flush()
+        return
+    if pretty:
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+    else:
+        json.dump(result, sys.stdout, ensure_ascii=False, separators=(",", ":"))
+    sys.stdout.write("\n")
+    sys.stdout.flush()
+
+
+# --- Minimal streaming XLSX reader (stdlib zipfile + ElementTree) ---
+# Reads cached cell values only (like openpyxl data_only=True).
+
+
+def _xml_local(tag):
+    """Strip the {namespace} prefix from an ElementTree tag or attribute."""
+    return tag.rpartition("}")[2]
+
+
+def _xlsx_column_letters(index):
+    """1 -> A, 26 -> Z, 27 -> AA, 33 -> AG."""
+    letters = ""
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+def _xlsx_sheets(zf):
+    """Map sheet name -> worksheet XML member path, in workbook order."""
+    from xml.etree import ElementTree
+
+    rels = {
+        el.get("Id"): el.get("Target")
+        for el in ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    }
+    sheets = {}
+    for el in ElementTree.fromstring(zf.read("xl/workbook.xml")).iter():
+        if _xml_local(el.tag) != "sheet":
+            continue
+        rel_id = next(v for k, v in el.attrib.items() if _xml_local(k) == "id")
+        target = rels[rel_id]
+        if target.startswith("/"):
+            sheets[el.get("name")] = target.lstrip("/")
+        else:
+            sheets[el.get("name")] = posixpath.normpath(posixpath.join("xl", target))
+    return sheets
 
 
-def cmd_parse_xlsx(args):
-    """Parse Yandex Direct XLSX export."""
-    import openpyxl
+def _xlsx_text(el):
+    """Text of a shared/inline string: plain <t> or rich-text runs, no phonetics."""
+    parts = []
+    for child in el:
+        tag = _xml_local(child.tag)
+        if tag == "t":
+            parts.append(child.text or "")
+        elif tag == "r":
+            parts.extend(t.text or "" for t in child if _xml_local(t.tag) == "t")
+    return "".join(parts)
 
-    wb = openpyxl.load_workbook(args.file, data_only=True)
-    if "Тексты" not in wb.sheetnames:
-        sys.exit(
-            f"Error: лист 'Тексты' не найден. Доступные: {wb.sheetnames}"
-        )
-    ws = wb["Тексты"]
 
-    # Find campaign minus-phrases (scan rows 1-20, cols A-F)
-    campaign_minus = ""
-    found_minus = False
-    for row in ws.iter_rows(min_row=1, max_row=20, min_col=1, max_col=6, values_only=False):
-        if found_minus:
-            break
-        for cell in row:
-            if cell.value and "Минус-фразы на кампанию" in str(cell.value):
-                next_cell = ws.cell(row=cell.row, column=cell.column + 1)
-                if next_cell.value:
-                    campaign_minus = str(next_cell.value).strip()
-                found_minus = True
-                break
-
-    # Find first data row: col A == "-" and col G non-empty
-    data_start = None
-    for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=1, max_col=1, values_only=False):
-        cell = row[0]
-        if cell.value and str(cell.value).strip() == "-":
-            # Check col G
-            g_cell = ws.cell(row=cell.row, column=7)
-            if g_cell.value and str(g_cell.value).strip():
-                data_start = cell.row
-                break
-
-    if data_start is None:
-        sys.exit("Error: не найдены строки данных (col A='-' с непустой col G)")
-
-    # Collect groups
-    groups = OrderedDict()  # group_id -> {name, group_minus_set, phrases_list}
-    for row_idx in range(data_start, ws.max_row + 1):
-        col_a = ws.cell(row=row_idx, column=1).value
-        if col_a is None or str(col_a).strip() != "-":
-            continue
+def _xlsx_shared_strings(zf):
+    """Load the shared strings table (empty if the workbook has none)."""
+    from xml.etree import ElementTree
 
-        col_g = ws.cell(row=row_idx, column=7).value
-        if col_g is None or not str(col_g).strip():
-            continue
+    try:
+        f = zf.open("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    strings = []
+    with f:
+        for _, el in ElementTree.iterparse(f):
+            if _xml_local(el.tag) == "si":
+                strings.append(_xlsx_text(el))
+                el.clear()
+    return strings
+
+
+def _xlsx_cell_value(cell, shared_strings):
+    """Decode one <c> element the way openpyxl does for common cell types."""
+    cell_type = cell.get("t", "n")
+    if cell_type == "inlineStr":
+        return next(
+            (_xlsx_text(child) for child in cell if _xml_local(child.tag) == "is"),
+            None,
+        )
+    value = next(
+        (child.text for child in cell if _xml_local(child.tag) == "v"), None
+    )
+    if value is None:
+        return None
+    if cell_type == "s":
+        return shared_strings[int(value)]
+    if cell_type == "n":
+        if "." in value or "E" in value or "e" in value:
+            return float(value)
+        return int(value)
+    if cell_type == "b":
+        return value == "1"
+    return value  # str (formula result), e (error code), d (ISO date)
+
+
+def _iter_xlsx_rows(zf, member, shared_strings, max_col):
+    """Stream (row_idx, values) for each stored row of a worksheet.
+
+    values is a tuple of the first max_col cells (None where empty); cells
+    further right are skipped without decoding.
+    """
+    from xml.etree import ElementTree
 
-        col_c = ws.cell(row=row_idx, column=3).value
-        if col_c is None or not str(col_c).strip():
-            continue  # skip rows with empty group_id
+    columns = {_xlsx_column_letters(i): i - 1 for i in range(1, max_col + 1)}
+    row_idx = 0
+    with zf.open(member) as f:
+        for _, el in ElementTree.iterparse(f):
+            if _xml_local(el.tag) != "row":
+                continue
+            r = el.get("r")
+            row_idx = int(r) if r else row_idx + 1
+            values = [None] * max_col
+            col = -1
+            for cell in el:
+                if _xml_local(cell.tag) != "c":
+                    continue
+                ref = cell.get("r")
+                col = columns.get(ref.rstrip("0123456789"), max_col) if ref else col + 1
+                if col < max_col:
+                    values[col] = _xlsx_cell_value(cell, shared_strings)
+            el.clear()
+            yield row_idx, tuple(values)
 
-        group_id = str(col_c).strip()
-        group_name = str(ws.cell(row=row_idx, column=4).value or "").strip()
-        phrase = str(col_g).strip()
 
-        # Col AG (33) - group minus
-        col_ag = ws.cell(row=row_idx, column=33).value
-        group_minus_val = str(col_ag).strip() if col_ag else ""
+def cmd_parse_xlsx(args):
+    """Parse Yandex Direct XLSX export."""
+    import zipfile
 
-        if group_id not in groups:
-            groups[group_id] = {
-                "name": group_name,
-                "group_minus_set": set(),
-                "phrases_ordered": OrderedDict(),
-            }
+    try:
+        zf = zipfile.ZipFile(args.file)
+    except (OSError, zipfile.BadZipFile) as e:
+        sys.exit(f"Error: не удалось открыть XLSX: {e}")
+
+    with zf:
+        sheets = _xlsx_sheets(zf)
+        if "Тексты" not in sheets:
+            sys.exit(
+                f"Error: лист 'Тексты' не найден. Доступные: {list(sheets)}"
+            )
+        rows = _iter_xlsx_rows(zf, sheets["Тексты"], _xlsx_shared_strings(zf), 33)
+
+        # One forward pass over the stream:
+        #   - campaign minus-phrases: rows 1-20, label in cols A-F, value in next col
+        #   - data starts at the first row with col A == "-" and col G non-empty
+        #   - groups are collected from there (cols A, C, D, G, AG = 0, 2, 3, 6, 32)
+        campaign_minus = ""
+        minus_pending = True
+        collecting = False
+        groups = {}  # group_id -> {name, group_minus_set, phrases_list, phrases_seen}
+        for row_idx, row in rows:
+            if minus_pending and row_idx <= 20:
+                col = next(
+                    (i for i, v in enumerate(row[:6])
+                     if v and "Минус-фразы на кампанию" in str(v)),
+                    None,
+                )
+                if col is not None:
+                    minus_pending = False
+                    if row[col + 1]:
+                        campaign_minus = str(row[col + 1]).strip()
+
+            # Filter on col A first; exact "-" (the usual data-row value) and
+            # empty cells are decided without str()/strip()
+            col_a = row[0]
+            if col_a != "-" and (col_a is None or str(col_a).strip() != "-"):
+                continue
 
-        g = groups[group_id]
-        # Deduplicate phrases preserving order
-        g["phrases_ordered"][phrase] = None
-        if group_minus_val:
-            g["group_minus_set"].add(group_minus_val)
+            col_g = row[6]
+            phrase = str(col_g).strip() if col_g is not None else ""
+            if not phrase or not (collecting or col_g):
+                continue
+            collecting = True
 
-    wb.close()
+            col_c = row[2]
+            if col_c is None:
+                continue
+            group_id = str(col_c).strip()
+            if not group_id:
+                continue  # skip rows with empty group_id
+            group_name = str(row[3] or "").strip()
+
+            # Col AG (33) - group minus
+            col_ag = row[32]
+            group_minus_val = str(col_ag).strip() if col_ag else ""
+
+            if group_id not in groups:
+                groups[group_id] = {
+                    "name": group_name,
+                    "group_minus_set": set(),
+                    "phrases_list": [],
+                    "phrases_seen": set(),
+                }
+
+            g = groups[group_id]
+            # Deduplicate phrases preserving order
+            if phrase not in g["phrases_seen"]:
+                g["phrases_seen"].add(phrase)
+                g["phrases_list"].append(phrase)
+            if group_minus_val:
+                g["group_minus_set"].add(group_minus_val)
+
+        if not collecting:
+            sys.exit("Error: не найдены строки данных (col A='-' с непустой col G)")
 
     # Build output
     result_groups = []
@@ -119,7 +285,7 @@ def cmd_parse_xlsx(args):
             "id": gid,
             "name": g["name"],
             "group_minus": " ".join(sorted(g["group_minus_set"])),
-            "phrases": list(g["phrases_ordered"].keys()),
+            "phrases": g["phrases_list"],
         })
 
     # Filter by --group if specified
@@ -131,68 +297,168 @@ def cmd_parse_xlsx(args):
         "campaign_minus_length": len(campaign_minus),
         "groups": result_groups,
     }
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+    print_json(result, args.pretty)
 
 
 def sanitize_variant(variant, slot_name):
     """Sanitize a slot variant. Returns (cleaned, warnings)."""
-    warnings = []
-    cleaned = variant
+    # Fast path for the common already-clean variant: single-spaced (no
+    # tabs/NBSP, which isprintable() rejects), no operators, nothing to strip
+    stripped = variant.strip()
+    if (
+        stripped[:1] not in LEADING_OPERATORS
+        and stripped.isprintable()
+        and "  " not in stripped
+        and " +" not in stripped
+        and " -" not in stripped
+        and " !" not in stripped
+        and SANITIZE_CHARS.isdisjoint(stripped)
+    ):
+        return stripped, []
 
-    # Strip punctuation (муз. центр -> муз центр)
-    if PUNCTUATION_RE.search(cleaned):
-        cleaned = PUNCTUATION_RE.sub("", cleaned)
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    warnings = []
 
-    # Remove forbidden OR-syntax characters (replace with space to avoid merging tokens)
-    if FORBIDDEN_CHARS_RE.search(cleaned):
+    # Strip punctuation (муз. центр -> муз центр) and replace forbidden
+    # OR-syntax characters with spaces (to avoid merging tokens) in one pass
+    if any(c in variant for c in FORBIDDEN_CHARS):
         warnings.append(
             f"slot '{slot_name}': вариант '{variant}' содержит OR-синтаксис, деградирован в многословный"
         )
-        cleaned = FORBIDDEN_CHARS_RE.sub(" ", cleaned)
-        # Collapse multiple spaces
-        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    tokens = variant.translate(SANITIZE_TABLE).split()
 
     # Remove leading operators (+ - !) from each token
-    tokens = cleaned.split()
-    new_tokens = []
-    for t in tokens:
-        if LEADING_OPERATOR_RE.match(t):
-            stripped = LEADING_OPERATOR_RE.sub("", t)
-            if stripped:
-                warnings.append(
-                    f"slot '{slot_name}': убран ведущий оператор из '{t}'"
-                )
-                new_tokens.append(stripped)
-        else:
-            new_tokens.append(t)
-    cleaned = " ".join(new_tokens)
+    if any(t[0] in LEADING_OPERATORS for t in tokens):
+        new_tokens = []
+        for t in tokens:
+            if t[0] in LEADING_OPERATORS:
+                stripped = t[1:]
+                if stripped:
+                    warnings.append(
+                        f"slot '{slot_name}': убран ведущий оператор из '{t}'"
+                    )
+                    new_tokens.append(stripped)
+            else:
+                new_tokens.append(t)
+        tokens = new_tokens
+    # Joining the split tokens also collapses whitespace
+    cleaned = " ".join(tokens)
 
     return cleaned.strip(), warnings
 
 
 def add_stop_word_plus(variant):
     """Add + prefix to stop words in a variant string."""
-    tokens = variant.split()
     result = []
-    for t in tokens:
-        # Don't touch tokens already starting with operator
-        if t[0] in ("+", "-", "!"):
-            result.append(t)
-        elif t.lower() in STOP_WORDS:
-            result.append(f"+{t}")
-        else:
-            result.append(t)
+    for t in variant.split():
+        # Don't touch tokens already starting with operator.
+        # STOP_WORDS are lowercase: try t as-is before paying for lower()
+        if t[0] not in LEADING_OPERATORS and (t in STOP_WORDS or t.lower() in STOP_WORDS):
+            t = "+" + t
+        result.append(t)
     return " ".join(result)
 
 
+@functools.lru_cache(maxsize=16384)
 def normalize_token(token):
     """Normalize a token for comparison: lowercase, strip punctuation."""
-    t = token.lower().strip()
-    t = PUNCTUATION_RE.sub("", t)
-    t = LEADING_OPERATOR_RE.sub("", t)
-    t = FORBIDDEN_CHARS_RE.sub("", t)
-    return t.strip()
+    t = token.lower().strip().translate(PUNCTUATION_TABLE)
+    if t and t[0] in LEADING_OPERATORS:
+        t = t[1:]
+    return t.translate(FORBIDDEN_TABLE).strip()
+
+
+@functools.lru_cache(maxsize=4096)
+def clean_variant(variant, slot_name):
+    """sanitize_variant + add_stop_word_plus, memoized for repeated variants.
+
+    Returns (cleaned, warnings) with warnings as a tuple.
+    """
+    cleaned, warnings = sanitize_variant(variant, slot_name)
+    if cleaned:
+        cleaned = add_stop_word_plus(cleaned)
+    return cleaned, tuple(warnings)
+
+
+# Trim priority: additional -> modifiers -> actions (objects untouched)
+TRIM_ORDER = ("additional", "modifiers", "actions")
+MAX_ESTIMATED_PHRASES = 200
+
+
+def build_or_string(slot_variants):
+    """Build OR part: (a|b|c) or a."""
+    if not slot_variants:
+        return ""
+    if len(slot_variants) == 1:
+        return slot_variants[0]
+    return "(" + "|".join(slot_variants) + ")"
+
+
+def estimate_phrases(slots):
+    """Calculate estimated phrase count (product of non-empty slot sizes)."""
+    product = 1
+    for variants in slots.values():
+        if variants:
+            product *= len(variants)
+    return product
+
+
+def trim_slots(slots, slot_order, max_query_length):
+    """Trim slot variants in place to the phrase-count and query-length limits.
+
+    Pops the last variant of the first slot in TRIM_ORDER that has more than
+    one, first while estimate_phrases() > MAX_ESTIMATED_PHRASES, then while
+    the assembled query is longer than max_query_length. Query length is
+    tracked per slot and updated in O(1) per pop.
+
+    Returns:
+        (query, trimmed): the assembled query (still too long if nothing is
+        left to trim) and the list of removals.
+    """
+    trimmed = []
+
+    def pop_variant(reason):
+        for trim_slot in TRIM_ORDER:
+            if len(slots[trim_slot]) > 1:
+                removed = slots[trim_slot].pop()
+                trimmed.append({"slot": trim_slot, "removed": removed, "reason": reason})
+                return trim_slot
+        return None
+
+    estimated = estimate_phrases(slots)
+    while estimated > MAX_ESTIMATED_PHRASES:
+        trim_slot = pop_variant(f"estimated_phrases > {MAX_ESTIMATED_PHRASES}")
+        if trim_slot is None:
+            break
+        n = len(slots[trim_slot])
+        estimated = estimated // (n + 1) * n
+
+    # Non-empty OR-strings are joined with single spaces. Trimming never
+    # empties a slot, so only the trimmed slot's length changes, and it is
+    # updated arithmetically: "(a|b|c)" -> "(a|b)" loses len(c) + 1, while
+    # "(a|b)" -> "a" becomes len(a). OR-strings of trimmed slots are rebuilt
+    # once at the end; untouched slots reuse their cached string.
+    or_strings = {name: build_or_string(slots[name]) for name in slot_order}
+    lengths = {name: len(or_strings[name]) for name in slot_order}
+    non_empty = sum(1 for length in lengths.values() if length)
+    query_length = sum(lengths.values()) + max(non_empty - 1, 0)
+    touched = set()
+    while query_length > max_query_length:
+        trim_slot = pop_variant(f"query_length > {max_query_length}")
+        if trim_slot is None:
+            break
+        touched.add(trim_slot)
+        variants = slots[trim_slot]
+        if len(variants) == 1:
+            new_length = len(variants[0])
+        else:
+            new_length = lengths[trim_slot] - len(trimmed[-1]["removed"]) - 1
+        query_length += new_length - lengths[trim_slot]
+        lengths[trim_slot] = new_length
+
+    for name in touched:
+        or_strings[name] = build_or_string(slots[name])
+    parts = (or_strings[name] for name in slot_order)
+    return " ".join(part for part in parts if part), trimmed
 
 
 class SlotMerger:
@@ -203,15 +469,16 @@ class SlotMerger:
     """
 
     SLOT_NAMES = ["objects", "actions", "modifiers", "additional"]
+    # Matched against lowercased, single-spaced text (see _compute_coverage),
+    # so no IGNORECASE folding and a literal space instead of \s+
     ADDITIONAL_PATTERN_RE = re.compile(
-        r'\b(' + '|'.join(STOP_WORDS) + r')\s+(\S+)',
-        re.IGNORECASE,
+        r'\b(' + '|'.join(STOP_WORDS) + r') (\S+)'
     )
 
     def __init__(self, phrases):
         self._phrases = list(phrases)
         self._slots = {
-            name: OrderedDict() for name in self.SLOT_NAMES
+            name: {} for name in self.SLOT_NAMES
         }
 
     def merge_batch(self, batch_index, phrase_indexes, slots):
@@ -226,11 +493,17 @@ class SlotMerger:
             ValueError: if phrase_indexes are out of range
         """
         n = len(self._phrases)
-        for pi in phrase_indexes:
-            if not isinstance(pi, int) or pi < 0 or pi >= n:
-                raise ValueError(
-                    f"phrase_index {pi} вне диапазона [0..{n - 1}]"
-                )
+        # Type/min/max checks run in C; walk the list only to report the culprit
+        if phrase_indexes and not (
+            set(map(type, phrase_indexes)) <= {int, bool}
+            and min(phrase_indexes) >= 0
+            and max(phrase_indexes) < n
+        ):
+            for pi in phrase_indexes:
+                if not isinstance(pi, int) or pi < 0 or pi >= n:
+                    raise ValueError(
+                        f"phrase_index {pi} вне диапазона [0..{n - 1}]"
+                    )
         for slot_name in self.SLOT_NAMES:
             variants = slots.get(slot_name, [])
             if not isinstance(variants, list):
@@ -242,14 +515,21 @@ class SlotMerger:
                 cleaned, _ = sanitize_variant(v_str, slot_name)
                 if not cleaned:
                     continue
-                canon = re.sub(r'\s+', ' ', cleaned.lower()).strip()
+                # sanitize_variant already collapsed whitespace and stripped
+                canon = cleaned.lower()
                 slot_dict = self._slots[slot_name]
                 if canon not in slot_dict:
+                    # Normalized tokens, shared by subset removal and coverage
+                    tokens = (normalize_token(t) for t in canon.split())
                     slot_dict[canon] = {
                         "display": cleaned,
-                        "batch_indexes": set(),
+                        "batch_indexes": [],
+                        "tokens": frozenset(t for t in tokens if t),
                     }
-                slot_dict[canon]["batch_indexes"].add(batch_index)
+                # Batches arrive in order, so the list stays sorted and unique
+                batch_indexes = slot_dict[canon]["batch_indexes"]
+                if not batch_indexes or batch_indexes[-1] != batch_index:
+                    batch_indexes.append(batch_index)
 
     def _remove_subsets(self):
         """Remove subset variants within each slot (heuristic).
@@ -260,76 +540,87 @@ class SlotMerger:
         """
         for slot_name in self.SLOT_NAMES:
             slot_dict = self._slots[slot_name]
-            keys = list(slot_dict.keys())
-            token_sets = {}
-            for k in keys:
-                tokens = set(
-                    normalize_token(t)
-                    for t in k.split()
-                    if normalize_token(t)
-                )
-                token_sets[k] = tokens
-            to_remove = set()
-            for i, k_short in enumerate(keys):
-                for j, k_long in enumerate(keys):
-                    if i == j or k_long in to_remove:
-                        continue
-                    ts_short = token_sets[k_short]
-                    ts_long = token_sets[k_long]
-                    if ts_short and ts_short < ts_long:
-                        to_remove.add(k_long)
+            # Token sets as int bitmasks: A < B  <=>  A & B == A and A != B
+            token_bits = {}
+            masks = {}
+            for k, entry in slot_dict.items():
+                mask = 0
+                for t in entry["tokens"]:
+                    mask |= 1 << token_bits.setdefault(t, len(token_bits))
+                masks[k] = mask
+
+            # Bucket non-empty masks by their lowest set bit: a subset of
+            # mask must have its lowest bit among mask's own bits, so only
+            # those buckets need checking instead of every other variant
+            buckets = {}
+            for m in set(masks.values()):
+                if m:
+                    buckets.setdefault(m & -m, []).append(m)
+
+            to_remove = []
+            for k, mask in masks.items():
+                rest = mask
+                while rest:
+                    low = rest & -rest
+                    rest ^= low
+                    if any(
+                        c != mask and c & mask == c
+                        for c in buckets.get(low, ())
+                    ):
+                        to_remove.append(k)
+                        break
             for k in to_remove:
                 del slot_dict[k]
 
     def _compute_coverage(self):
         """Compute coverage of original phrases by merged slot variants."""
-        all_variant_tokens = set()
-        for slot_name in self.SLOT_NAMES:
-            for canon in self._slots[slot_name]:
-                for t in canon.split():
-                    nt = normalize_token(t)
-                    if nt:
-                        all_variant_tokens.add(nt)
+        all_variant_tokens = set().union(*(
+            entry["tokens"]
+            for slot_name in self.SLOT_NAMES
+            for entry in self._slots[slot_name].values()
+        ))
+
+        additional_variants_lower = self._slots.get("additional", {})
 
         uncovered_phrases = []
         all_phrase_tokens = set()
+        additional_patterns = []
+        seen_patterns = set()
         for idx, phrase in enumerate(self._phrases):
-            phrase_tokens = set()
-            for t in phrase.split():
-                nt = normalize_token(t)
-                if nt and nt not in STOP_WORDS:
-                    phrase_tokens.add(nt)
-                    all_phrase_tokens.add(nt)
-            if phrase_tokens and not (phrase_tokens & all_variant_tokens):
+            # Single-spaced, lowercased, punctuation-free: feeds both checks
+            words = phrase.lower().translate(PUNCTUATION_TABLE).split()
+
+            phrase_tokens = set(map(normalize_token, words))
+            phrase_tokens.discard("")
+            phrase_tokens -= STOP_WORDS
+            all_phrase_tokens |= phrase_tokens
+            if phrase_tokens and phrase_tokens.isdisjoint(all_variant_tokens):
                 uncovered_phrases.append({"index": idx, "phrase": phrase})
 
-        uncovered_tokens = sorted(
-            all_phrase_tokens - all_variant_tokens - STOP_WORDS
-        )
-
-        additional_variants_lower = set(
-            self._slots.get("additional", OrderedDict()).keys()
-        )
-        additional_patterns = []
-        seen_patterns = set()
-        for phrase in self._phrases:
-            normalized_phrase = PUNCTUATION_RE.sub("", phrase.lower())
-            normalized_phrase = re.sub(r'\s+', ' ', normalized_phrase).strip()
+            normalized_phrase = " ".join(words)
             for m in self.ADDITIONAL_PATTERN_RE.finditer(normalized_phrase):
-                pattern = re.sub(r'\s+', ' ', m.group(0)).strip()
+                pattern = m.group(0)
                 if pattern not in seen_patterns:
                     seen_patterns.add(pattern)
                     if pattern not in additional_variants_lower:
                         additional_patterns.append(pattern)
 
+        uncovered_tokens = sorted(
+            all_phrase_tokens - all_variant_tokens - STOP_WORDS
+        )
+
         return {
             "uncovered_phrases": uncovered_phrases,
             "uncovered_tokens": uncovered_tokens,
             "additional_patterns": additional_patterns,
         }
 
-    def finalize(self, max_query_length=4096):
-        """Finalize merged slots: deduplicate, remove subsets, build query."""
+    def finalize(self, max_query_length=4096, include_debug=False):
+        """Finalize merged slots: deduplicate, remove subsets, build query.
+
+        With include_debug, the result also maps each variant to the
+        batches that produced it under "debug".
+        """
         self._remove_subsets()
 
         slots_pre_trim = {}
@@ -341,16 +632,8 @@ class SlotMerger:
 
         coverage = self._compute_coverage()
 
-        debug = {}
-        for slot_name in self.SLOT_NAMES:
-            debug[slot_name] = {
-                entry["display"]: sorted(entry["batch_indexes"])
-                for entry in self._slots[slot_name].values()
-            }
-
         slot_order = self.SLOT_NAMES
         warnings = []
-        trimmed = []
 
         sanitized_slots = {}
         for slot_name in slot_order:
@@ -359,86 +642,43 @@ class SlotMerger:
                 clean_variants.append(add_stop_word_plus(entry["display"]))
             sanitized_slots[slot_name] = clean_variants
 
-        def build_or_string(slot_variants):
-            if not slot_variants:
-                return ""
-            if len(slot_variants) == 1:
-                return slot_variants[0]
-            return "(" + "|".join(slot_variants) + ")"
-
-        def assemble_query(s_slots):
-            parts = []
-            for name in slot_order:
-                or_str = build_or_string(s_slots[name])
-                if or_str:
-                    parts.append(or_str)
-            return " ".join(parts)
-
-        def est_phrases(s_slots):
-            product = 1
-            for name in slot_order:
-                n = len(s_slots[name])
-                if n > 0:
-                    product *= n
-            return product
-
-        trim_order = ["additional", "modifiers", "actions"]
-        while est_phrases(sanitized_slots) > 200:
-            trimmed_any = False
-            for trim_slot in trim_order:
-                if len(sanitized_slots[trim_slot]) > 1:
-                    removed = sanitized_slots[trim_slot].pop()
-                    trimmed.append({
-                        "slot": trim_slot, "removed": removed,
-                        "reason": "estimated_phrases > 200",
-                    })
-                    trimmed_any = True
-                    break
-            if not trimmed_any:
-                break
-
-        query = assemble_query(sanitized_slots)
-        while len(query) > max_query_length:
-            trimmed_any = False
-            for trim_slot in trim_order:
-                if len(sanitized_slots[trim_slot]) > 1:
-                    removed = sanitized_slots[trim_slot].pop()
-                    trimmed.append({
-                        "slot": trim_slot, "removed": removed,
-                        "reason": f"query_length > {max_query_length}",
-                    })
-                    trimmed_any = True
-                    query = assemble_query(sanitized_slots)
-                    break
-            if not trimmed_any:
-                warnings.append(
-                    f"query_length {len(query)} > {max_query_length}"
-                    " после максимальной обрезки"
-                )
-                break
+        query, trimmed = trim_slots(sanitized_slots, slot_order, max_query_length)
+        if len(query) > max_query_length:
+            warnings.append(
+                f"query_length {len(query)} > {max_query_length}"
+                " после максимальной обрезки"
+            )
 
         slots_post_trim = {}
         for slot_name in slot_order:
             slots_post_trim[slot_name] = list(sanitized_slots[slot_name])
 
-        return {
+        result = {
             "slots_pre_trim": slots_pre_trim,
             "slots_post_trim": slots_post_trim,
             "query": query,
-            "estimated_phrases": est_phrases(sanitized_slots),
+            "estimated_phrases": estimate_phrases(sanitized_slots),
             "query_length": len(query),
             "trimmed": trimmed,
             "warnings": warnings,
             "coverage": coverage,
-            "debug": debug,
         }
+        if include_debug:
+            result["debug"] = {
+                slot_name: {
+                    entry["display"]: entry["batch_indexes"]
+                    for entry in self._slots[slot_name].values()
+                }
+                for slot_name in self.SLOT_NAMES
+            }
+        return result
 
 
 def cmd_merge_slots(args):
     """Merge batch segmentation results from stdin JSON."""
-    raw = sys.stdin.read()
+    raw = sys.stdin.buffer.read()
     try:
-        data = json.loads(raw)
+        data = json_loads(raw)
     except json.JSONDecodeError as e:
         sys.exit(f"Error: невалидный JSON на stdin: {e}")
 
@@ -468,20 +708,24 @@ def cmd_merge_slots(args):
         except ValueError as e:
             sys.exit(f"Error: batch[{i}]: {e}")
 
-    result = merger.finalize(max_query_length=args.max_query_length)
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+    result = merger.finalize(
+        max_query_length=args.max_query_length,
+        include_debug=args.debug,
+    )
+    print_json(result, args.pretty)
 
 
 def cmd_build_query(args):
     """Build OR-query from slots JSON."""
     try:
-        slots = json.loads(args.slots_json)
+        slots = json_loads(args.slots_json)
     except json.JSONDecodeError as e:
         sys.exit(f"Error: невалидный JSON слотов: {e}")
+    if not isinstance(slots, dict):
+        sys.exit("Error: JSON слотов не объект")
 
     max_len = args.max_query_length
     warnings = []
-    trimmed = []
 
     # Slot order: actions, objects, modifiers, additional
     slot_order = ["actions", "objects", "modifiers", "additional"]
@@ -497,161 +741,343 @@ def cmd_build_query(args):
             v_str = str(v).strip()
             if not v_str:
                 continue
-            cleaned, san_warnings = sanitize_variant(v_str, slot_name)
+            cleaned, san_warnings = clean_variant(v_str, slot_name)
             warnings.extend(san_warnings)
             if cleaned:
-                # Apply stop-word plus
-                cleaned = add_stop_word_plus(cleaned)
                 clean_variants.append(cleaned)
         sanitized_slots[slot_name] = clean_variants
 
-    def build_or_string(slot_variants):
-        """Build OR part: (a|b|c) or a."""
-        if len(slot_variants) == 0:
-            return ""
-        if len(slot_variants) == 1:
-            return slot_variants[0]
-        return "(" + "|".join(slot_variants) + ")"
-
-    def assemble_query(s_slots):
-        """Assemble full query from slots dict."""
-        parts = []
-        for name in slot_order:
-            or_str = build_or_string(s_slots[name])
-            if or_str:
-                parts.append(or_str)
-        return " ".join(parts)
-
-    def estimated_phrases(s_slots):
-        """Calculate estimated phrase count (product of slot sizes)."""
-        product = 1
-        for name in slot_order:
-            n = len(s_slots[name])
-            if n > 0:
-                product *= n
-        return product
-
-    # Trim priority: additional -> modifiers -> actions (objects untouched)
-    trim_order = ["additional", "modifiers", "actions"]
-
-    # Check estimated phrases limit
-    while estimated_phrases(sanitized_slots) > 200:
-        trimmed_any = False
-        for trim_slot in trim_order:
-            if len(sanitized_slots[trim_slot]) > 1:
-                removed = sanitized_slots[trim_slot].pop()
-                trimmed.append({"slot": trim_slot, "removed": removed, "reason": "estimated_phrases > 200"})
-                trimmed_any = True
-                break
-        if not trimmed_any:
-            break
-
-    # Check query length limit
-    query = assemble_query(sanitized_slots)
-    while len(query) > max_len:
-        trimmed_any = False
-        for trim_slot in trim_order:
-            if len(sanitized_slots[trim_slot]) > 1:
-                removed = sanitized_slots[trim_slot].pop()
-                trimmed.append({"slot": trim_slot, "removed": removed, "reason": f"query_length > {max_len}"})
-                trimmed_any = True
-                query = assemble_query(sanitized_slots)
-                break
-        if not trimmed_any:
-            warnings.append(
-                f"query_length {len(query)} всё ещё > {max_len} после максимальной обрезки"
-            )
-            break
+    query, trimmed = trim_slots(sanitized_slots, slot_order, max_len)
+    if len(query) > max_len:
+        warnings.append(
+            f"query_length {len(query)} всё ещё > {max_len} после максимальной обрезки"
+        )
 
     result = {
         "query": query,
-        "estimated_phrases": estimated_phrases(sanitized_slots),
+        "estimated_phrases": estimate_phrases(sanitized_slots),
         "query_length": len(query),
         "trimmed": trimmed,
         "warnings": warnings,
     }
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+    print_json(result, args.pretty)
 
 
-def cmd_query_total(args):
-    """Get totalCount from Wordstat API."""
-    body = {"phrase": args.phrase}
-    if args.regions:
-        try:
-            body["regions"] = [int(r.strip()) for r in args.regions.split(",")]
-        except ValueError:
-            sys.exit(f"Error: невалидные regions: {args.regions}")
+WORDSTAT_HOST = "api.wordstat.yandex.net"
+WORDSTAT_TOP_REQUESTS_PATH = "/v1/topRequests"
+WORDSTAT_RATE_LIMIT = 10  # requests per second, see config/README.md
+WORDSTAT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+WORDSTAT_MAX_RETRIES = 4  # backoff 1, 2, 4, 8 s unless Retry-After is sent
+WORDSTAT_MAX_RETRY_AFTER = 60  # cap on a server-sent Retry-After, seconds
+TOTALS_CACHE_PATH = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "wordstat_totals.sqlite",
+)
 
-    data = json.dumps(body).encode("utf-8")
-    url = "https://api.wordstat.yandex.net/v1/topRequests"
-
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={
-            "Authorization": f"Bearer {args.token}",
-            "Content-Type": "application/json; charset=utf-8",
-        },
-        method="POST",
+
+class RateLimiter:
+    """Space request starts at least 1/rate seconds apart (thread-safe)."""
+
+    def __init__(self, rate):
+        import threading
+
+        self._interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def wordstat_connection(timeout=30):
+    """Open a keep-alive HTTPS connection to the Wordstat API.
+
+    Honors HTTPS_PROXY/https_proxy and NO_PROXY like urllib does: with a
+    proxy, the connection goes to the proxy and tunnels to Wordstat via
+    CONNECT.
+    """
+    import base64
+    import http.client
+    import urllib.request
+    from urllib.parse import unquote, urlsplit
+
+    proxy = urllib.request.getproxies().get("https")
+    if not proxy or urllib.request.proxy_bypass(WORDSTAT_HOST):
+        return http.client.HTTPSConnection(WORDSTAT_HOST, timeout=timeout)
+
+    parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    headers = {}
+    if parts.username:
+        credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+        headers["Proxy-Authorization"] = f"Basic {token}"
+    conn = http.client.HTTPSConnection(
+        parts.hostname, parts.port or 8080, timeout=timeout
     )
+    conn.set_tunnel(WORDSTAT_HOST, 443, headers)
+    return conn
 
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            resp_body = resp.read().decode("utf-8")
-    except urllib.error.HTTPError as e:
-        raw = ""
+
+def _raw_snippet(body):
+    """First 500 characters of a response body, for error reports."""
+    # 4 bytes per char at most: decode only the bytes that can matter
+    return body[:2000].decode("utf-8", errors="replace")[:500]
+
+
+def _retry_delay(resp, retries):
+    """Seconds to wait before retrying: Retry-After if given, else backoff.
+
+    Retry-After is capped at WORDSTAT_MAX_RETRY_AFTER so a huge value
+    can't stall the run.
+    """
+    retry_after = (resp.getheader("Retry-After") or "").strip()
+    if retry_after.isdigit():
+        return min(int(retry_after), WORDSTAT_MAX_RETRY_AFTER)
+    return 2 ** retries
+
+
+def query_total(conn, token, phrase, regions=None, limiter=None):
+    """POST one phrase to Wordstat over an open connection.
+
+    Every attempt, including reconnects and retries, first waits for
+    `limiter` (a RateLimiter) when one is given.
+
+    Returns {"total_count", "query"} or an {"error", "query", ...} dict.
+    The body is parsed as bytes; only error snippets are decoded to str.
+    """
+    import http.client
+
+    body = {"phrase": phrase}
+    if regions:
+        body["regions"] = regions
+    data = json.dumps(body).encode("utf-8")
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json; charset=utf-8",
+    }
+
+    reconnected = False
+    retries = 0
+    while True:
+        if limiter:
+            limiter.wait()
         try:
-            raw = e.read().decode("utf-8")[:500]
-        except Exception:
-            pass
-        result = {"error": f"HTTP {e.code}: {e.reason}", "query": args.phrase, "raw": raw}
-        print(json.dumps(result, ensure_ascii=False))
-        sys.exit(1)
-    except urllib.error.URLError as e:
-        result = {"error": f"URL error: {e.reason}", "query": args.phrase}
-        print(json.dumps(result, ensure_ascii=False))
-        sys.exit(1)
+            conn.request("POST", WORDSTAT_TOP_REQUESTS_PATH, body=data, headers=headers)
+            resp = conn.getresponse()
+            resp_body = resp.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+            # Server dropped an idle keep-alive connection: reconnect once
+            conn.close()
+            if reconnected:
+                return {"error": f"URL error: {e}", "query": phrase}
+            reconnected = True
+            continue
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            return {"error": f"URL error: {e}", "query": phrase}
+        if resp.status in WORDSTAT_RETRY_STATUSES and retries < WORDSTAT_MAX_RETRIES:
+            # Rate limited or transient server error: back off, then retry
+            time.sleep(_retry_delay(resp, retries))
+            retries += 1
+            continue
+        break
+
+    if resp.status >= 400:
+        return {
+            "error": f"HTTP {resp.status}: {resp.reason}",
+            "query": phrase,
+            "raw": _raw_snippet(resp_body),
+        }
 
     try:
-        obj = json.loads(resp_body)
+        obj = json_loads(resp_body)
     except json.JSONDecodeError:
-        result = {"error": "Invalid JSON response", "query": args.phrase, "raw": resp_body[:500]}
-        print(json.dumps(result, ensure_ascii=False))
-        sys.exit(1)
+        return {"error": "Invalid JSON response", "query": phrase, "raw": _raw_snippet(resp_body)}
 
     # Check for errors (multiple possible formats)
     if "error" in obj:
-        err_val = obj["error"]
-        result = {"error": str(err_val), "query": args.phrase, "raw": resp_body[:500]}
-        print(json.dumps(result, ensure_ascii=False))
-        sys.exit(1)
+        return {"error": str(obj["error"]), "query": phrase, "raw": _raw_snippet(resp_body)}
 
     if "error_code" in obj:
         err_msg = f"{obj.get('error_str', '')}: {obj.get('error_detail', '')}"
-        result = {
+        return {
             "error": err_msg.strip(": "),
             "error_code": obj["error_code"],
-            "query": args.phrase,
-            "raw": resp_body[:500],
+            "query": phrase,
+            "raw": _raw_snippet(resp_body),
         }
-        print(json.dumps(result, ensure_ascii=False))
-        sys.exit(1)
 
     # Extract totalCount with fallbacks
     total_count = obj.get("totalCount")
     if total_count is None:
         total_count = (obj.get("result") or {}).get("totalCount")
     if total_count is None:
-        result = {
+        return {
             "error": "totalCount not found in response",
-            "query": args.phrase,
-            "raw": resp_body[:500],
+            "query": phrase,
+            "raw": _raw_snippet(resp_body),
         }
-        print(json.dumps(result, ensure_ascii=False))
-        sys.exit(1)
 
-    result = {"total_count": int(total_count), "query": args.phrase}
-    print(json.dumps(result, ensure_ascii=False))
+    return {"total_count": int(total_count), "query": phrase}
+
+
+class TotalsCache:
+    """On-disk cache of successful totals keyed by (phrase, regions), with TTL.
+
+    A database error after opening (locked by another run, disk full,
+    corrupt file) disables the cache for the rest of the run: lookups
+    miss and stores are dropped, so results keep streaming.
+    """
+
+    def __init__(self, path, ttl_hours):
+        import sqlite3
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._ttl = ttl_hours * 3600
+        self._disabled = False
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS totals"
+            " (key TEXT PRIMARY KEY, total INTEGER, ts REAL)"
+        )
+
+    @staticmethod
+    def _key(phrase, regions):
+        import hashlib
+
+        regions_part = ",".join(map(str, regions or ()))
+        return hashlib.sha1(f"{phrase}|{regions_part}".encode("utf-8")).hexdigest()
+
+    def _disable(self, error):
+        print(f"Warning: кэш недоступен ({error}), запросы без кэша", file=sys.stderr)
+        self._disabled = True
+
+    def get(self, phrase, regions):
+        import sqlite3
+
+        if self._disabled:
+            return None
+        try:
+            row = self._db.execute(
+                "SELECT total FROM totals WHERE key = ? AND ts >= ?",
+                (self._key(phrase, regions), time.time() - self._ttl),
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._disable(e)
+            return None
+        return row[0] if row else None
+
+    def put(self, phrase, regions, total):
+        import sqlite3
+
+        if self._disabled:
+            return
+        try:
+            with self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO totals (key, total, ts) VALUES (?, ?, ?)",
+                    (self._key(phrase, regions), total, time.time()),
+                )
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def close(self):
+        self._db.close()
+
+
+def read_phrases(path):
+    """Read one phrase per line from a file ("-" = stdin), skipping blanks."""
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError as e:
+            sys.exit(f"Error: не удалось прочитать {path}: {e}")
+    return [line.strip() for line in lines if line.strip()]
+
+
+def cmd_query_total(args):
+    """Get totalCount from Wordstat API.
+
+    With --phrases-file, prints one JSON object per line (NDJSON) in input
+    order. Up to --concurrency requests are in flight at once, each worker
+    thread reusing its own keep-alive HTTPS connection (through HTTPS_PROXY
+    when set), and request starts are throttled to the API rate limit,
+    retries included. 429/5xx responses are retried after Retry-After or
+    an exponential backoff. Successful totals are cached on disk for
+    --cache-ttl-hours (0 disables the cache); cache hits skip the API.
+    """
+    import sqlite3
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    if args.concurrency < 1:
+        sys.exit(f"Error: --concurrency должно быть >= 1: {args.concurrency}")
+
+    regions = None
+    if args.regions:
+        try:
+            regions = [int(r.strip()) for r in args.regions.split(",")]
+        except ValueError:
+            sys.exit(f"Error: невалидные regions: {args.regions}")
+
+    if args.phrases_file:
+        phrases = read_phrases(args.phrases_file)
+    else:
+        phrases = [args.phrase]
+
+    cache = None
+    if args.cache_ttl_hours > 0:
+        try:
+            cache = TotalsCache(TOTALS_CACHE_PATH, args.cache_ttl_hours)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Warning: кэш недоступен ({e}), запросы без кэша", file=sys.stderr)
+
+    # Cache is only touched from the main thread; workers fetch misses
+    cached = [cache.get(p, regions) if cache else None for p in phrases]
+    misses = [p for p, total in zip(phrases, cached) if total is None]
+
+    limiter = RateLimiter(WORDSTAT_RATE_LIMIT)
+    local = threading.local()
+    conns = []
+
+    def fetch(phrase):
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            conn = local.conn = wordstat_connection()
+            conns.append(conn)
+        return query_total(conn, args.token, phrase, regions, limiter)
+
+    failed = False
+    workers = max(1, min(args.concurrency, len(misses)))
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            fetched = pool.map(fetch, misses)
+            for phrase, total in zip(phrases, cached):
+                if total is not None:
+                    result = {"total_count": total, "query": phrase}
+                else:
+                    result = next(fetched)
+                    if "error" in result:
+                        failed = True
+                    elif cache:
+                        cache.put(phrase, regions, result["total_count"])
+                print_json(result)
+    finally:
+        for conn in conns:
+            conn.close()
+        if cache:
+            cache.close()
+
+    if failed:
+        sys.exit(1)
 
 
 def main():
@@ -662,11 +1088,15 @@ def main():
     p_parse = sub.add_parser("parse-xlsx", help="Parse Yandex Direct XLSX export")
     p_parse.add_argument("file", help="Path to XLSX file")
     p_parse.add_argument("--group", default=None, help="Filter by group ID")
+    p_parse.add_argument("--pretty", action="store_true", help="Indent JSON output")
+    p_parse.set_defaults(func=cmd_parse_xlsx)
 
     # build-query
     p_build = sub.add_parser("build-query", help="Build OR-query from slots")
     p_build.add_argument("slots_json", help="JSON string with slots")
     p_build.add_argument("--max-query-length", type=int, default=4096, help="Max query length (default: 4096)")
+    p_build.add_argument("--pretty", action="store_true", help="Indent JSON output")
+    p_build.set_defaults(func=cmd_build_query)
 
     # merge-slots
     p_merge = sub.add_parser(
@@ -677,22 +1107,35 @@ def main():
         "--max-query-length", type=int, default=4096,
         help="Max query length (default: 4096)",
     )
+    p_merge.add_argument("--pretty", action="store_true", help="Indent JSON output")
+    p_merge.add_argument(
+        "--debug", action="store_true",
+        help="Include which batches produced each variant",
+    )
+    p_merge.set_defaults(func=cmd_merge_slots)
 
     # query-total
     p_query = sub.add_parser("query-total", help="Get totalCount from Wordstat API")
     p_query.add_argument("--token", required=True, help="Yandex Wordstat API token")
-    p_query.add_argument("--phrase", required=True, help="Search phrase with operators")
+    p_query_src = p_query.add_mutually_exclusive_group(required=True)
+    p_query_src.add_argument("--phrase", help="Search phrase with operators")
+    p_query_src.add_argument(
+        "--phrases-file", default=None,
+        help="File with one phrase per line ('-' = stdin); prints NDJSON",
+    )
+    p_query.add_argument(
+        "--concurrency", type=int, default=8,
+        help="Parallel requests with --phrases-file (default: 8)",
+    )
+    p_query.add_argument(
+        "--cache-ttl-hours", type=float, default=24,
+        help="Reuse cached totals younger than this; 0 disables (default: 24)",
+    )
     p_query.add_argument("--regions", default=None, help="Region IDs comma-separated")
+    p_query.set_defaults(func=cmd_query_total)
 
     args = parser.parse_args()
-    if args.command == "parse-xlsx":
-        cmd_parse_xlsx(args)
-    elif args.command == "build-query":
-        cmd_build_query(args)
-    elif args.command == "merge-slots":
-        cmd_merge_slots(args)
-    elif args.command == "query-total":
-        cmd_query_total(args)
+    args.func(args)
 
 
 if __name__ == "__main__":
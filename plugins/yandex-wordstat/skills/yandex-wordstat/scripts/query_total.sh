@@ -4,8 +4,10 @@
 #
 # Usage:
 #   bash scripts/query_total.sh --phrase "(купить|заказать) телефон ретро" [--regions "213"]
+#   bash scripts/query_total.sh --phrases-file phrases.txt [--regions "213"] [--concurrency 8] [--cache-ttl-hours 24]
 #
 # Output: JSON {"total_count": N, "query": "..."} or {"error": "...", "query": "..."}
+# With --phrases-file: one such JSON object per line, in input order
 
 set -e
 
@@ -26,29 +28,47 @@ fi
 
 # Parse arguments
 PHRASE=""
+PHRASES_FILE=""
 REGIONS=""
+CONCURRENCY=""
+CACHE_TTL_HOURS=""
 
 while [ $# -gt 0 ]; do
     case $1 in
         --phrase|-p) PHRASE="$2"; shift 2 ;;
+        --phrases-file|-f) PHRASES_FILE="$2"; shift 2 ;;
         --regions|-r) REGIONS="$2"; shift 2 ;;
+        --concurrency|-c) CONCURRENCY="$2"; shift 2 ;;
+        --cache-ttl-hours) CACHE_TTL_HOURS="$2"; shift 2 ;;
         *) echo "Unknown option: $1"; exit 1 ;;
     esac
 done
 
-if [ -z "$PHRASE" ]; then
+if [ -z "$PHRASE" ] && [ -z "$PHRASES_FILE" ]; then
     echo "Usage: query_total.sh --phrase \"(a|b) query\" [--regions \"213\"]"
+    echo "       query_total.sh --phrases-file phrases.txt [--regions \"213\"]"
     echo ""
     echo "Options:"
-    echo "  --phrase, -p   Search phrase with operators and minus-words (required)"
-    echo "  --regions, -r  Region IDs, comma-separated (optional)"
+    echo "  --phrase, -p        Search phrase with operators and minus-words"
+    echo "  --phrases-file, -f  File with one phrase per line ('-' = stdin)"
+    echo "  --regions, -r       Region IDs, comma-separated (optional)"
+    echo "  --concurrency, -c   Parallel requests with --phrases-file (default: 8)"
+    echo "  --cache-ttl-hours   Cache lifetime for totals, 0 disables it (default: 24)"
     echo ""
-    echo "Output: JSON with total_count"
+    echo "Output: JSON with total_count (one line per phrase with --phrases-file)"
     exit 1
 fi
 
 # Delegate to Python
+if [ -n "$PHRASES_FILE" ]; then
+    set -- --phrases-file "$PHRASES_FILE"
+else
+    set -- --phrase "$PHRASE"
+fi
+
 uv run --script "$SCRIPT_DIR/missed_demand.py" query-total \
     --token "$YANDEX_WORDSTAT_TOKEN" \
-    --phrase "$PHRASE" \
-    ${REGIONS:+--regions "$REGIONS"}
+    "$@" \
+    ${REGIONS:+--regions "$REGIONS"} \
+    ${CONCURRENCY:+--concurrency "$CONCURRENCY"} \
+    ${CACHE_TTL_HOURS:+--cache-ttl-hours "$CACHE_TTL_HOURS"}